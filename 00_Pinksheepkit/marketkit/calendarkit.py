@@ -0,0 +1,167 @@
+""" Calendarkit.py module
+
+    Trading-hours calendar of XAU 1H bars as sorted datetime64 arrays
+
+    1. calk.read_excluded_time(path)
+    2. calk.is_trading_time(times)
+    3. calk.trading_hours(start, end, excluded_time)
+    4. calk.next_trading_hours(initial_time, count, excluded_time)
+    5. calk.period_bounds(origin, terminal, period)
+    6. calk.partition(times, starts, ends)
+"""
+
+# import
+import numpy as np
+import pandas as pd
+
+# 1 bar = 1 hour
+BAR = np.timedelta64(1, 'h')
+
+# Supported partition periods
+PERIODS = ('day', 'week', 'month')
+
+
+# 1. calk.read_excluded_time()
+def read_excluded_time(path: str) -> np.ndarray:
+    """ read holidays or other excluded bar times from csv file
+
+    args:
+    1. path: csv file with column 'time' i.e. 2022-01-10 05:00
+
+    out:
+    1. sorted np.ndarray of datetime64[h]
+    """
+
+    df_excluded = pd.read_csv(path, parse_dates=['time'])
+
+    return np.sort(df_excluded['time'].to_numpy().astype('datetime64[h]'))
+
+
+# 2. calk.is_trading_time()
+def is_trading_time(times: np.ndarray) -> np.ndarray:
+    """ mask of bar times when XAU market is open
+
+    XAU market close -> [SAT 05.00 - MON 04.00]
+
+    args:
+    1. times: array-like of datetime64
+
+    out:
+    1. np.ndarray of bool
+    """
+
+    hours = np.asarray(times, dtype='datetime64[h]')
+    days = hours.astype('datetime64[D]')
+
+    # 1970-01-01 is thursday -> shift so that monday = 0
+    weekday = (days.astype(np.int64) + 3) % 7
+    hour = (hours - days).astype(np.int64)
+
+    return (((weekday >= 1) & (weekday <= 4)) |
+            ((weekday == 5) & (hour < 5)) |
+            ((weekday == 0) & (hour > 4)))
+
+
+# 3. calk.trading_hours()
+def trading_hours(start: object, end: object, excluded_time: object = ()) -> np.ndarray:
+    """ all valid bar times in [start, end)
+
+    args:
+    1. start: first bar time candidate i.e. datetime, pd.Timestamp, np.datetime64
+    2. end: stop time (exclusive)
+    3. excluded_time: array-like of holidays or other excluded bar times
+
+    out:
+    1. sorted np.ndarray of datetime64[h]
+    """
+
+    hours = np.arange(np.datetime64(start, 'h'), np.datetime64(end, 'h'), BAR)
+    excluded = np.asarray(excluded_time, dtype='datetime64[h]')
+
+    return hours[is_trading_time(hours) & ~np.isin(hours, excluded)]
+
+
+# 4. calk.next_trading_hours()
+def next_trading_hours(initial_time: object, count: int, excluded_time: object = ()) -> np.ndarray:
+    """ initial bar time followed by the next count - 1 valid bar times
+
+    args:
+    1. initial_time: time of the first bar (not checked against the calendar)
+    2. count: number of bar times
+    3. excluded_time: array-like of holidays or other excluded bar times
+
+    out:
+    1. np.ndarray of datetime64[h] with length count
+    """
+
+    initial = np.datetime64(initial_time, 'h')
+    if count <= 0:
+        return np.empty(0, dtype='datetime64[h]')
+
+    # Widen the window until it holds enough valid bars
+    span = 2 * count + 7 * 24
+    while True:
+        hours = trading_hours(initial + BAR, initial + span * BAR, excluded_time)
+        if len(hours) >= count - 1:
+            return np.r_[initial, hours[:count - 1]]
+        span *= 2
+
+
+# 5. calk.period_bounds()
+def period_bounds(origin: object, terminal: object, period: str = 'week') -> tuple:
+    """ start and end times of every period from origin until terminal
+
+    periods keep the time of day of origin (i.e. XAU session opens 05:00)
+    day   -> [origin + n days, + 1 day)
+    week  -> [monday of origin week + n weeks, + 6 days)
+    month -> [first day of origin month + n months, + 1 month)
+
+    args:
+    1. origin: first bar time
+    2. terminal: last bar time, periods start before it
+    3. period: 'day', 'week' or 'month'
+
+    out:
+    1. np.ndarray of period start datetime64[ns]
+    2. np.ndarray of period end datetime64[ns] (exclusive)
+    """
+
+    origin = pd.Timestamp(origin)
+    terminal = pd.Timestamp(terminal)
+
+    if period == 'day':
+        starts = pd.date_range(origin, terminal, freq=pd.DateOffset(days=1), inclusive='left')
+        ends = starts + pd.DateOffset(days=1)
+    elif period == 'week':
+        first = origin - pd.Timedelta(days=origin.weekday())
+        starts = pd.date_range(first, terminal, freq=pd.DateOffset(weeks=1), inclusive='left')
+        ends = starts + pd.DateOffset(days=6)
+    elif period == 'month':
+        first = origin.replace(day=1)
+        starts = pd.date_range(first, terminal, freq=pd.DateOffset(months=1), inclusive='left')
+        ends = starts + pd.DateOffset(months=1)
+    else:
+        raise ValueError(f"period must be one of {PERIODS}, got {period!r}")
+
+    return starts.to_numpy(dtype='datetime64[ns]'), ends.to_numpy(dtype='datetime64[ns]')
+
+
+# 6. calk.partition()
+def partition(times: object, starts: np.ndarray, ends: np.ndarray) -> tuple:
+    """ row ranges of sorted times falling in each [start, end) period
+
+    args:
+    1. times: sorted array-like of datetime64
+    2. starts: period start times
+    3. ends: period end times (exclusive)
+
+    out:
+    1. np.ndarray of first row of each period
+    2. np.ndarray of stop row of each period (exclusive) -> rows[first:stop]
+    """
+
+    times = np.asarray(times, dtype='datetime64[ns]')
+    first = np.searchsorted(times, starts, side='left')
+    stop = np.searchsorted(times, ends, side='left')
+
+    return first, np.maximum(stop, first)
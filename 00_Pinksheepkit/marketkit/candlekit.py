@@ -0,0 +1,214 @@
+""" Candlekit.py module
+
+    Vectorized candlestick geometry over whole OHLC blocks
+
+    1. candk.candle_geometry(df_ohlc)
+    2. candk.candle_color(change, bull, bear)
+    3. candk.candle_code(df_ohlc, change)
+    4. candk.candle_label(code)
+    5. candk.transition_count(code, order)
+    6. candk.TransitionCounter(order).update(code) / .frame() / .crosstab()
+"""
+
+# import
+import numpy as np
+import pandas as pd
+
+# OHLC columns
+OHLC = ['open', 'high', 'low', 'close']
+
+# Candle type dimensions i.e. +S01 = bullish, small, upper wick 0, lower wick 1
+DIRECTION_LABELS = ['+', '-']                    # %change >= 0, < 0
+VOLA_BINS = [0, 0.25, 0.50, 1.00, np.inf]        # |%change| right-closed like pd.cut
+VOLA_LABELS = ['S', 'M', 'L', 'XL']
+WICK_BINS = [-1, 0, 1, np.inf]                   # wick / body right-closed like pd.cut
+WICK_LABELS = ['0', '1', '2']
+
+# Number of candle types, code = ((direction * 4 + vola) * 3 + upper wick) * 3 + lower wick
+K = len(DIRECTION_LABELS) * len(VOLA_LABELS) * len(WICK_LABELS) ** 2
+CANDLE_TYPES = np.array([d + v + u + l for d in DIRECTION_LABELS for v in VOLA_LABELS
+                         for u in WICK_LABELS for l in WICK_LABELS])
+
+# Largest dense transition table (K ** (order + 1) cells) counted with bincount
+TRANSITION_LIMIT = 1 << 26
+
+
+# 1. candk.candle_geometry()
+def candle_geometry(df_ohlc: pd.DataFrame) -> pd.DataFrame:
+    """ body and wick geometry of each candle from one sort of the OHLC block
+
+    args:
+    1. df_ohlc: pd.DataFrame with open, high, low, close columns
+
+    out:
+    1. pd.DataFrame (same index) with columns
+        candle: body height         = sorted[2] - sorted[1]
+        w+:     upper wick height   = sorted[3] - sorted[2]
+        w-:     lower wick (<= 0)   = sorted[0] - sorted[1]
+        bottom: body bottom         = sorted[1]
+        upper:  body top            = sorted[2]
+    """
+
+    block = np.sort(df_ohlc[OHLC].to_numpy(dtype=np.float64), axis=1)
+
+    return pd.DataFrame({'candle': block[:, 2] - block[:, 1],
+                         'w+': block[:, 3] - block[:, 2],
+                         'w-': block[:, 0] - block[:, 1],
+                         'bottom': block[:, 1],
+                         'upper': block[:, 2]},
+                        index=df_ohlc.index)
+
+
+# 2. candk.candle_color()
+def candle_color(change: object, bull: str, bear: str) -> np.ndarray:
+    """ bull color where %change >= 0 else bear color
+
+    args:
+    1. change: array-like of %change
+    2. bull: bullish color i.e. "#51A299"
+    3. bear: bearish color i.e. "#DD5E57"
+
+    out:
+    1. np.ndarray of color of each candle
+    """
+
+    return np.where(np.asarray(change) >= 0, bull, bear)
+
+
+def _bin(values: np.ndarray, bins: list) -> np.ndarray:
+    """ right-closed bin index of values like pd.cut(labels=False), -1 if outside or NaN """
+
+    index = np.searchsorted(bins, values, side='left') - 1
+    index[(index >= len(bins) - 1) | np.isnan(values)] = -1
+
+    return index
+
+
+# 3. candk.candle_code()
+def candle_code(df_ohlc: pd.DataFrame, change: object = None) -> np.ndarray:
+    """ candle type of each candle packed into one integer in [0, K)
+
+    Each dimension is binned to a small integer and packed mixed-radix:
+    direction (+ -), volatility (S M L XL), upper and lower wick / body (0 1 2).
+
+    args:
+    1. df_ohlc: pd.DataFrame with open, high, low, close columns
+    2. change: array-like of %change (None = df_ohlc['%Change'])
+
+    out:
+    1. np.ndarray of int64 code, -1 where a dimension is undefined
+       (i.e. %change = 0 has no volatility bin, flat candle has no wick ratio)
+    """
+
+    change = np.asarray(df_ohlc['%Change'] if change is None else change, dtype=np.float64)
+    geometry = candle_geometry(df_ohlc)
+    body = geometry['candle'].to_numpy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        upper = _bin(geometry['w+'].to_numpy() / body, WICK_BINS)
+        lower = _bin(-geometry['w-'].to_numpy() / body, WICK_BINS)
+    direction = (change < 0).astype(np.int64)
+    vola = _bin(np.abs(change), VOLA_BINS)
+
+    code = ((direction * len(VOLA_LABELS) + vola) * len(WICK_LABELS) + upper) * len(WICK_LABELS) + lower
+    code[(vola < 0) | (upper < 0) | (lower < 0)] = -1
+
+    return code
+
+
+# 4. candk.candle_label()
+def candle_label(code: object) -> np.ndarray:
+    """ label of candle codes i.e. 1 -> '+S01', -1 -> None
+
+    args:
+    1. code: int or array-like of codes (see candle_code)
+
+    out:
+    1. np.ndarray of str (object, None where code is -1)
+    """
+
+    code = np.asarray(code)
+    labels = np.append(CANDLE_TYPES.astype(object), None)
+
+    return labels[np.where(code >= 0, code, K)]
+
+
+# 5. candk.transition_count()
+def transition_count(code: object, order: int = 1) -> np.ndarray:
+    """ count sequences of order + 1 consecutive candle types
+
+    Each window is packed into key = code[t] * K ** order + ... + code[t + order]
+    and keys are counted with one np.bincount; windows with -1 codes are skipped.
+
+    args:
+    1. code: array-like of codes (see candle_code)
+    2. order: 1 -> code[t] to code[t + 1], n -> n previous types to the next one
+
+    out:
+    1. np.ndarray of int64 with shape (K,) * (order + 1),
+       counts[i1, i2, ...] = number of windows i1 -> i2 -> ...
+    """
+
+    if order < 1:
+        raise ValueError(f"order must be >= 1, got {order}")
+    size = K ** (order + 1)
+    if size > TRANSITION_LIMIT:
+        raise ValueError(f"order {order} needs {size} cells, more than TRANSITION_LIMIT {TRANSITION_LIMIT}")
+
+    code = np.asarray(code, dtype=np.int64)
+    windows = len(code) - order
+    if windows <= 0:
+        return np.zeros((K,) * (order + 1), dtype=np.int64)
+
+    key = np.zeros(windows, dtype=np.int64)
+    valid = np.ones(windows, dtype=bool)
+    for step in range(order + 1):
+        part = code[step:step + windows]
+        key = key * K + part
+        valid &= part >= 0
+
+    return np.bincount(key[valid], minlength=size).reshape((K,) * (order + 1))
+
+
+# 6. candk.TransitionCounter()
+class TransitionCounter:
+    """ running transition counts updated as new candles arrive
+
+    The last order codes of each update are kept, so windows across two
+    updates are counted once and counting in chunks equals counting at once.
+    """
+
+    def __init__(self, order: int = 1) -> None:
+        self.order = order
+        self.counts = transition_count([], order)
+        self.tail = np.empty(0, dtype=np.int64)
+
+    def update(self, code: object) -> 'TransitionCounter':
+        """ add codes of new candles (see candle_code) in time order """
+
+        code = np.concatenate([self.tail, np.asarray(code, dtype=np.int64)])
+        self.counts += transition_count(code, self.order)
+        self.tail = code[len(code) - min(self.order, len(code)):]
+
+        return self
+
+    def frame(self) -> pd.DataFrame:
+        """ observed sequences as columns i1, i2, ... (labels) and count, sorted by labels like groupby """
+
+        index = np.nonzero(self.counts)
+        frame = pd.DataFrame({f'i{step + 1}': CANDLE_TYPES[codes] for step, codes in enumerate(index)})
+        frame['count'] = self.counts[index]
+
+        return frame.sort_values(by=list(frame.columns[:-1]), kind='stable').reset_index(drop=True)
+
+    def crosstab(self) -> pd.DataFrame:
+        """ first-order table type -> next type of observed types only, sorted by label """
+
+        if self.order != 1:
+            raise ValueError(f"crosstab needs order 1, got {self.order}")
+        observed = np.flatnonzero(self.counts.sum(axis=0) + self.counts.sum(axis=1))
+        observed = observed[np.argsort(CANDLE_TYPES[observed], kind='stable')]
+
+        return pd.DataFrame(self.counts[np.ix_(observed, observed)],
+                            index=pd.Index(CANDLE_TYPES[observed], name='type'),
+                            columns=CANDLE_TYPES[observed])
@@ -0,0 +1,435 @@
+""" Storekit.py module
+
+    Typed columnar store of XAU bars and Forex events shared by every stage
+
+    csv files stay the exchange format, each load keeps a typed store next to
+    the csv (.parquet with pyarrow, .npz of plain arrays otherwise) and reads
+    it while it is newer than the csv, so datetime strings are parsed only once.
+    Neither format can run code on load, so no store is ever pickled.
+
+    1. stk.read_bars_csv(path)
+    2. stk.read_events_csv(path)
+    3. stk.event_datetime(date, time)
+    4. stk.write_store(df, path)
+    5. stk.read_store(path)
+    6. stk.load_bars(path, cache, start, end)
+    7. stk.load_events(path, cache)
+    8. stk.BarFile(path).bars(start, end) / .append(df_bars)
+    9. stk.parse_numbers(numbers)
+"""
+
+# import
+import os
+import re
+import warnings
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Parquet needs pyarrow, .npz of plain numpy arrays keeps the same dtypes without it
+try:
+    import pyarrow  # noqa: F401
+    STORE_SUFFIX = '.parquet'
+except ImportError:
+    STORE_SUFFIX = '.npz'
+
+# Bar schema i.e. 03-Jan-2022, 05:00:00,1827.1,1829.03,1827.1,1829.03,0.1056
+BAR_COLUMNS = ['time', 'open', 'high', 'low', 'close', '%Change']
+BAR_TIME_FORMAT = '%d-%b-%Y, %H:%M:%S'
+
+# Event schema i.e. 2023-05-11,21:30,USD,Low,Natural Gas Storage,,78B,54B
+EVENT_COLUMNS = ['date', 'time', 'currency', 'impact', 'event', 'actual', 'forecast', 'previous']
+EVENT_CATEGORIES = ['currency', 'impact']
+
+# Number columns of events parsed at ingest -> {col}_value float64, {col}_unit category
+NUMBER_COLUMNS = ['actual', 'forecast', 'previous']
+NUMBER_PATTERN = re.compile(r'^[<>]?(?P<number>[-+]?[\d,]*\.?\d+)(?P<unit>[%KMBT]?)$', re.IGNORECASE)
+UNIT_MULTIPLIER = {'%': 1.0, 'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}
+EVENT_NUMBER_COLUMNS = [f'{col}_{part}' for col in NUMBER_COLUMNS for part in ('value', 'unit')]
+
+# Fixed-width record of .bars file (48 bytes per bar, native byte order)
+BAR_DTYPE = np.dtype([('time', 'M8[s]'), ('open', 'f8'), ('high', 'f8'),
+                      ('low', 'f8'), ('close', 'f8'), ('%Change', 'f8')])
+
+
+# 1. stk.read_bars_csv()
+def read_bars_csv(path: str) -> pd.DataFrame:
+    """ parse bars csv written by candlestick_reader into typed columns
+
+    args:
+    1. path: csv file with columns [index, time, open, high, low, close, %Change]
+
+    out:
+    1. pd.DataFrame: time datetime64, prices and %Change float64
+    """
+
+    df_bars = pd.read_csv(path, usecols=BAR_COLUMNS,
+                          dtype={col: 'float64' for col in BAR_COLUMNS[1:]})
+    df_bars['time'] = pd.to_datetime(df_bars['time'], format=BAR_TIME_FORMAT)
+
+    return df_bars[BAR_COLUMNS]
+
+
+# 2. stk.read_events_csv()
+def read_events_csv(path: str) -> pd.DataFrame:
+    """ parse events csv written by forex_factory_scrapper into typed columns
+
+    args:
+    1. path: csv file with columns [index, date, time, currency, impact, event,
+       actual, forecast, previous]
+
+    out:
+    1. pd.DataFrame: date and datetime datetime64, currency and impact category,
+       other columns str (NaN if empty), {actual, forecast, previous}_value float64
+       and _unit category (see parse_numbers)
+    """
+
+    df_events = pd.read_csv(path, usecols=EVENT_COLUMNS, dtype=str)
+
+    df_events['datetime'] = event_datetime(df_events['date'], df_events['time'])
+    df_events['date'] = pd.to_datetime(df_events['date'], format='%Y-%m-%d', errors='coerce')
+    for col in EVENT_CATEGORIES:
+        df_events[col] = df_events[col].astype('category')
+
+    # Parse numbers once here so analyses never re-parse strings
+    for col in NUMBER_COLUMNS:
+        numbers = parse_numbers(df_events[col])
+        df_events[f'{col}_value'] = numbers['value']
+        df_events[f'{col}_unit'] = numbers['unit']
+
+    return df_events[[*EVENT_COLUMNS, 'datetime', *EVENT_NUMBER_COLUMNS]]
+
+
+# 3. stk.event_datetime()
+def event_datetime(date: pd.Series, time: pd.Series) -> pd.Series:
+    """ datetime of events from date and time strings
+
+    time 'HH:MM' -> date + time
+    time blank   -> date (same time as the previous event on the page)
+    other time   -> NaT (i.e. All Day, Tentative)
+
+    args:
+    1. date: pd.Series of str i.e. 2023-05-11
+    2. time: pd.Series of str i.e. 21:30, ' ', All Day
+
+    out:
+    1. pd.Series of datetime64
+    """
+
+    text = (date + ' ' + time.fillna('')).str.rstrip(' ')
+
+    return pd.to_datetime(text, format='%Y-%m-%d %H:%M', errors='coerce').fillna(
+        pd.to_datetime(text, format='%Y-%m-%d', errors='coerce'))
+
+
+# 4. stk.write_store()
+def write_store(df: pd.DataFrame, path: str) -> Path:
+    """ write DataFrame to typed store chosen by file suffix
+
+    args:
+    1. df: pd.DataFrame
+    2. path: .parquet, .feather or .npz file
+
+    out:
+    1. Path of written file
+    """
+
+    path = Path(path)
+    temp_path = path.with_name(path.name + '.tmp')
+
+    # Write to temporary file then swap so readers never see half a store
+    if path.suffix == '.parquet':
+        df.to_parquet(temp_path, index=False)
+    elif path.suffix == '.feather':
+        df.reset_index(drop=True).to_feather(temp_path)
+    elif path.suffix == '.npz':
+        arrays = _npz_arrays(df)
+        with open(temp_path, 'wb') as file:
+            np.savez(file, **arrays)
+    else:
+        raise ValueError(f"unsupported store suffix {path.suffix!r}")
+    temp_path.replace(path)
+
+    return path
+
+
+# 5. stk.read_store()
+def read_store(path: str) -> pd.DataFrame:
+    """ read DataFrame from typed store chosen by file suffix
+
+    args:
+    1. path: .parquet, .feather or .npz file
+
+    out:
+    1. pd.DataFrame
+    """
+
+    path = Path(path)
+
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    if path.suffix == '.feather':
+        return pd.read_feather(path)
+    if path.suffix == '.npz':
+        with np.load(path, allow_pickle=False) as store:
+            return _npz_frame(store)
+    raise ValueError(f"unsupported store suffix {path.suffix!r}")
+
+
+def _npz_arrays(df: pd.DataFrame) -> dict:
+    """ plain arrays of each column i, savable without pickle
+
+    numeric and datetime64 columns -> {i}, category -> codes {i} + {i}.categories
+    + {i}.ordered, text (object or string) -> unicode {i} + missing mask {i}.na
+    """
+
+    arrays = {'columns': np.array(df.columns, dtype=str)}
+    for i, (col, series) in enumerate(df.items()):
+        key = str(i)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories
+            arrays[key] = series.cat.codes.to_numpy()
+            arrays[key + '.categories'] = np.array(categories, dtype=str if categories.dtype == object else None)
+            arrays[key + '.ordered'] = np.array(series.cat.ordered)
+        elif pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+            na = series.isna().to_numpy()
+            arrays[key] = np.array(series.where(~na, ''), dtype=str)
+            arrays[key + '.na'] = na
+        else:
+            arrays[key] = series.to_numpy()
+            if arrays[key].dtype == object:
+                raise TypeError(f"column {col!r} of dtype {series.dtype} has no .npz layout")
+
+    return arrays
+
+
+def _npz_frame(store: object) -> pd.DataFrame:
+    """ rebuild DataFrame from arrays of _npz_arrays (missing text -> NaN like read_csv) """
+
+    data = {}
+    for i, col in enumerate(store['columns']):
+        key = str(i)
+        if key + '.categories' in store.files:
+            data[col] = pd.Categorical.from_codes(store[key], store[key + '.categories'],
+                                                  ordered=bool(store[key + '.ordered']))
+        elif key + '.na' in store.files:
+            values = store[key].astype(object)
+            values[store[key + '.na']] = np.nan
+            data[col] = values
+        else:
+            data[col] = store[key]
+
+    return pd.DataFrame(data)
+
+
+def _load(path: str, read_csv: object, cache: bool, columns: list = None) -> pd.DataFrame:
+    """ read typed store, parsing csv only if its store is missing, stale or lacks columns """
+
+    path = Path(path)
+    if path.suffix != '.csv':
+        return read_store(path)
+
+    store_path = path.with_suffix(STORE_SUFFIX)
+    if store_path.exists() and store_path.stat().st_mtime >= path.stat().st_mtime:
+        df = read_store(store_path)
+        if columns is None or set(columns) <= set(df.columns):
+            return df
+
+    df = read_csv(path)
+    if cache:
+        try:
+            write_store(df, store_path)
+        except OSError:
+            pass  # Read-only folder -> parse csv every time
+
+    return df
+
+
+# 6. stk.load_bars()
+def load_bars(path: str, cache: bool = True, start: object = None, end: object = None) -> pd.DataFrame:
+    """ load bars in [start, end) from csv, typed store or .bars file
+
+    args:
+    1. path: bars .csv, store or .bars file
+    2. cache: keep typed store next to csv for later loads
+    3. start: first bar time (None = from first bar)
+    4. end: stop time, exclusive (None = until last bar)
+
+    out:
+    1. pd.DataFrame (see read_bars_csv)
+    """
+
+    # .bars file reads only pages of the requested range
+    if Path(path).suffix == '.bars':
+        return BarFile(path).bars(start, end)
+
+    df_bars = _load(path, read_bars_csv, cache)
+    if start is not None or end is not None:
+        times = df_bars['time']
+        mask = np.ones(len(df_bars), dtype=bool)
+        if start is not None:
+            mask &= (times >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (times < pd.Timestamp(end)).to_numpy()
+        df_bars = df_bars.loc[mask].reset_index(drop=True)
+
+    return df_bars
+
+
+# 7. stk.load_events()
+def load_events(path: str, cache: bool = True) -> pd.DataFrame:
+    """ load events from csv or typed store
+
+    args:
+    1. path: events .csv or store file
+    2. cache: keep typed store next to csv for later loads
+
+    out:
+    1. pd.DataFrame (see read_events_csv)
+    """
+
+    return _load(path, read_events_csv, cache, columns=EVENT_NUMBER_COLUMNS)
+
+
+# 8. stk.BarFile()
+class BarFile:
+    """ append-only file of fixed-width BAR_DTYPE records sorted by time
+
+    Opening maps the file with np.memmap, so it costs O(1) and a time range
+    read binary-searches the time field and touches only the pages it needs.
+    A record torn by a crash mid-append is not read, and the next append cuts
+    it off so later records stay aligned.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+
+    def _size(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def __len__(self) -> int:
+        """ number of whole records (a torn tail record is not counted) """
+
+        return self._size() // BAR_DTYPE.itemsize
+
+    def records(self) -> np.ndarray:
+        """ memory-mapped records (read-only), empty array if file is empty """
+
+        if len(self) == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.memmap(self.path, dtype=BAR_DTYPE, mode='r', shape=(len(self),))
+
+    def bars(self, start: object = None, end: object = None) -> pd.DataFrame:
+        """ bars in [start, end)
+
+        args:
+        1. start: first bar time (None = from first bar)
+        2. end: stop time, exclusive (None = until last bar)
+
+        out:
+        1. pd.DataFrame with columns BAR_COLUMNS (see read_bars_csv)
+        """
+
+        records = self.records()
+        times = records['time']
+
+        first = 0 if start is None else np.searchsorted(times, np.datetime64(pd.Timestamp(start), 's'), side='left')
+        stop = len(records) if end is None else np.searchsorted(times, np.datetime64(pd.Timestamp(end), 's'), side='left')
+        selected = records[first:max(first, stop)]
+
+        df_bars = pd.DataFrame({col: np.array(selected[col]) for col in BAR_COLUMNS})
+        df_bars['time'] = df_bars['time'].astype('datetime64[ns]')
+
+        return df_bars
+
+    def last_time(self) -> np.datetime64:
+        """ time of last bar, None if file is empty """
+
+        if len(self) == 0:
+            return None
+        return self.records()['time'][-1]
+
+    def append(self, df_bars: pd.DataFrame) -> int:
+        """ append bars newer than the last bar without rewriting the file
+
+        Bars at or before the last bar cannot be inserted into the sorted file:
+        those already stored with the same values are skipped, the others are
+        dropped with a warning.
+
+        args:
+        1. df_bars: pd.DataFrame with columns BAR_COLUMNS (see read_bars_csv)
+
+        out:
+        1. number of appended bars
+        """
+
+        records = np.empty(len(df_bars), dtype=BAR_DTYPE)
+        for col in BAR_COLUMNS:
+            records[col] = df_bars[col].to_numpy()
+        records = records[np.argsort(records['time'], kind='stable')]
+        if len(records) > 0:
+            records = records[np.r_[True, records['time'][1:] != records['time'][:-1]]]
+
+        # Keep the file sorted and duplicate free -> only bars after the last one
+        last_time = self.last_time()
+        if last_time is not None:
+            older = records[records['time'] <= last_time]
+            records = records[records['time'] > last_time]
+
+            # Compare whole records as bytes so NaN %Change matches itself
+            stored = self.records()
+            position = np.minimum(np.searchsorted(stored['time'], older['time']), len(stored) - 1)
+            record = np.dtype((np.void, BAR_DTYPE.itemsize))
+            dropped = older[np.array(stored[position]).view(record) != older.view(record)]
+            del stored
+            if len(dropped) > 0:
+                warnings.warn(f"{len(dropped)} bars from {dropped['time'][0]} to {dropped['time'][-1]} are "
+                              f"not stored and precede last bar {last_time} of {self.path}, dropped",
+                              stacklevel=2)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'ab') as file:
+            # Cut record torn by a crashed append so new records stay aligned
+            torn = self._size() % BAR_DTYPE.itemsize
+            if torn:
+                file.truncate(self._size() - torn)
+            records.tofile(file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        return len(records)
+
+
+# 9. stk.parse_numbers()
+def parse_numbers(numbers: pd.Series) -> pd.DataFrame:
+    """ split number strings into value and unit in one vectorized pass
+
+    value is scaled by its unit multiplier (K, M, B, T) so values of one event
+    compare across units, % values stay in percent. Strings which are not a
+    single number (i.e. 5-4-0, 1.2|3.4) give NaN value.
+
+    args:
+    1. numbers: pd.Series of str i.e. 6.5%, -0.3%, 100K, 1,400B, 2.8, <0.10%
+
+    out:
+    1. pd.DataFrame: value float64 i.e. 6.5, -0.3, 100000.0, 1.4e12, 2.8, 0.1
+                     unit category of %, K, M, B, T (NaN if no unit)
+    """
+
+    # Parse each distinct string once, scraped columns repeat the same few thousand values
+    codes, uniques = pd.factorize(numbers)
+    parts = pd.Series(uniques, dtype='string').str.strip().str.extract(NUMBER_PATTERN)
+    unit = parts['unit'].str.upper()
+    unit = unit.where(unit != '')
+
+    value = pd.to_numeric(parts['number'].str.replace(',', '', regex=False), errors='coerce').astype('float64')
+    value = (value * unit.map(UNIT_MULTIPLIER).astype('float64').fillna(1.0)).to_numpy()
+    unit_codes = pd.Categorical(unit, categories=list(UNIT_MULTIPLIER)).codes
+
+    # Missing strings (code -1) -> NaN value and unit
+    value = np.append(value, np.nan)[codes]
+    unit_codes = np.append(unit_codes, -1)[codes]
+
+    return pd.DataFrame({'value': value,
+                         'unit': pd.Categorical.from_codes(unit_codes, categories=list(UNIT_MULTIPLIER))},
+                        index=numbers.index)
@@ -1,21 +1,86 @@
-"""Module containing decorators for formatting Matplotlib charts in my favorite design"""
+"""Module containing decorators for formatting Matplotlib charts in my favorite design
+
+Single style module of the project: fonts are resolved relative to this package
+and cached on first use, matplotlib.pyplot is imported only when a chart needs it,
+so importing this module (or a data-prep module using it) costs almost nothing.
+
+    1. mtk.font(weight, size)
+    2. mtk.font_properties(weight)
+    3. mtk.pyplot()
+    4. mtk.configure_style(backend, dpi, grid_color)
+    5. mtk.h_font / mtk.l_font / mtk.c_font (lazy)
+    6. mtk.style(dpi, grid_color)
+"""
 
 # Imports
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+from functools import lru_cache
+from pathlib import Path
 
 # Configure fonts
-FONT_PATH = "/workspaces/Enterprise/00_Pinksheepkit/fonts/poppins/Poppins-{0}.ttf"
+FONT_DIR = Path(__file__).resolve().parents[1] / "fonts" / "poppins"
+FONT_FILE = "Poppins-{0}.ttf"
 HEADING = "Bold"
 LABEL = "Regular"
 CONTENT = "Light"
 
-h_font = {"fontproperties": fm.FontProperties(fname=FONT_PATH.format(HEADING)),
-          "size": 12}
-l_font = {"fontproperties": fm.FontProperties(fname=FONT_PATH.format(LABEL)),
-          "size": 10}
-c_font = {"fontproperties": fm.FontProperties(fname=FONT_PATH.format(CONTENT)),
-          "size": 8}
+# Default style (see configure_style)
+DPI = 300
+GRID_COLOR = "#f0f0f0"
+
+# Lazy module-level font kwargs -> usage: plt.some_method(**mtk.h_font)
+_FONTS = {"h_font": (HEADING, 12), "l_font": (LABEL, 10), "c_font": (CONTENT, 8)}
+
+
+# 1. mtk.font()
+def font(weight: str, size: float) -> dict:
+    """Font **kwargs of Poppins weight -> usage: plt.some_method(**font("Bold", 12))"""
+    return {"fontproperties": font_properties(weight), "size": size}
+
+
+# 2. mtk.font_properties()
+@lru_cache(maxsize=None)
+def font_properties(weight: str) -> object:
+    """FontProperties of Poppins weight i.e. Bold, Medium, Regular, created once per weight"""
+    import matplotlib.font_manager as fm
+
+    path = FONT_DIR / FONT_FILE.format(weight)
+    if not path.exists():
+        raise FileNotFoundError(f"font {path} does not exist")
+    return fm.FontProperties(fname=str(path))
+
+
+# 3. mtk.pyplot()
+def pyplot() -> object:
+    """matplotlib.pyplot, imported on first call"""
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+# 4. mtk.configure_style()
+def configure_style(backend: str = None, dpi: int = DPI, grid_color: str = GRID_COLOR) -> None:
+    """Apply project rc params, optionally select backend (i.e. Agg) before pyplot is imported"""
+    import matplotlib as mpl
+
+    if backend is not None:
+        mpl.use(backend)
+    mpl.rcParams.update(style(dpi, grid_color))
+
+
+# 5. mtk.h_font / mtk.l_font / mtk.c_font / mtk.plt
+def __getattr__(name: str) -> object:
+    if name in _FONTS:
+        return font(*_FONTS[name])
+    if name == "plt":
+        return pyplot()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# 6. mtk.style()
+def style(dpi: int = DPI, grid_color: str = GRID_COLOR) -> dict:
+    """Project rc params -> usage: with matplotlib.rc_context(mtk.style()): ... (no global change)"""
+    return {'grid.color': grid_color, 'figure.dpi': dpi}
+
 
 # alpha decorator (Simple two-axis charts)
 def alpha_format(function):
@@ -33,4 +98,4 @@ def alpha_format(function):
         # ax.set_ylabel(y_label, **l_font)
         # plt.xticks(**c_font)
         # plt.yticks(**c_font)
-        # plt.show()
\ No newline at end of file
+        # plt.show()
@@ -2,21 +2,35 @@
 
     Contains functions for facilitating pandas operation
 
-    1. pdk.agg_count(df)
+    1. pdk.agg_count(*iterators, sort, dropna)
+    2. pdk.agg_count_chunks(chunks, sort, dropna)
 """
 
 # import
+import numpy as np
 import pandas as pd
 
+# dense bincount path only if key space <= BINCOUNT_LIMIT and <= DENSE_FACTOR * rows,
+# sparse key spaces are counted with np.unique instead of allocating size-long arrays
+BINCOUNT_LIMIT = 1 << 24
+DENSE_FACTOR = 4
+
+
 # 1. pdk.agg_count()
-def agg_count(*args: object) -> list:
-    """ function to group and count set of data from iterators 
+def agg_count(*args: object, sort: bool = True, dropna: bool = True) -> list:
+    """ function to group and count set of data from iterators
+
+    each iterator is factorized to integer codes, codes are combined into one
+    integer key per tuple and keys are counted with bincount (or np.unique if
+    the key space is large or sparse) -> no DataFrame or groupby is built
 
     args:
-    1. args[*iterators]: i.e. list, tuple, numpy.array, pandas.DataFrame
+    1. args[*iterators]: i.e. list, tuple, numpy.array, pandas.Series of equal length
+    2. sort: True -> tuples in sorted order, False -> in first-seen order
+    3. dropna: drop tuples containing NaN / None (like groupby)
 
     out:
-    1. [*iterators, count]: [all unique zip(*iterators), count]
+    1. [*iterators, count]: [all unique zip(*iterators), count] as np.ndarray
 
     example:
     input: args[i1, i2, i3]     output: [i1, i2, i3, count]
@@ -32,8 +46,92 @@ def agg_count(*args: object) -> list:
 
     """
 
-    # create dataframe for all iterators
-    df_iters = pd.DataFrame(*args).transpose()
-    
-    # group by item and agg by counting
-    df_iters.groupby(df_iters.columns.tolist(),as_index=False).size()
+    return _count(args, None, sort, dropna)
+
+
+# 2. pdk.agg_count_chunks()
+def agg_count_chunks(chunks: object, sort: bool = True, dropna: bool = True) -> list:
+    """ agg_count over an iterable of chunks, holding only unique tuples in memory
+
+    args:
+    1. chunks: iterable of tuples of iterators i.e. ((i1[:n], i2[:n]), (i1[n:], i2[n:]), ...)
+       or pandas.DataFrame chunks (one iterator per column) i.e. pd.read_csv(..., chunksize=n)
+    2. sort: True -> tuples in sorted order, False -> in first-seen order
+    3. dropna: drop tuples containing NaN / None (like groupby)
+
+    out:
+    1. [*iterators, count]: same as agg_count of all chunks concatenated
+    """
+
+    result = None
+    for chunk in chunks:
+        if isinstance(chunk, pd.DataFrame):
+            chunk = [chunk[col] for col in chunk.columns]
+        counted = _count(chunk, None, sort, dropna)
+
+        # merge unique tuples of this chunk into running result (previous first)
+        if result is not None:
+            columns = [np.concatenate([previous, current])
+                       if previous.dtype.kind == current.dtype.kind
+                       or {previous.dtype.kind, current.dtype.kind} <= set('biuf')
+                       else np.concatenate([previous.astype(object), current.astype(object)])
+                       for previous, current in zip(result[:-1], counted[:-1])]
+            counted = _count(columns, np.concatenate([result[-1], counted[-1]]), sort, dropna)
+        result = counted
+
+    return result
+
+
+def _count(columns: object, weights: np.ndarray, sort: bool, dropna: bool) -> list:
+    """ count (or sum weights of) unique tuples of columns """
+
+    if len(columns) == 0:
+        raise ValueError("agg_count needs at least one iterator")
+
+    # factorize each iterator to codes in [0, len(uniques)), NaN -> -1 if dropna
+    factorized = [pd.factorize(np.asarray(column) if not isinstance(column, (pd.Series, pd.Index))
+                               else column, sort=sort, use_na_sentinel=dropna) for column in columns]
+    lengths = {len(codes) for codes, _ in factorized}
+    if len(lengths) > 1:
+        raise ValueError(f"iterators must have the same length, got {sorted(lengths)}")
+
+    valid = np.ones(lengths.pop(), dtype=bool)
+    for codes, _ in factorized:
+        valid &= codes >= 0
+    codes_list = [codes[valid].astype(np.int64) for codes, _ in factorized]
+    if weights is not None:
+        weights = np.asarray(weights)[valid]
+
+    # combine codes into one key (mixed radix), compact it if the key space overflows
+    key = np.zeros(len(codes_list[0]), dtype=np.int64)
+    size = 1
+    for codes, (_, uniques) in zip(codes_list, factorized):
+        base = max(len(uniques), 1)
+        if size * base >= np.iinfo(np.int64).max // 2:
+            compact, key = np.unique(key, return_inverse=True)
+            size = max(len(compact), 1)
+        key = key * base + codes
+        size *= base
+
+    # count keys and find first row of each unique key
+    if size <= min(BINCOUNT_LIMIT, DENSE_FACTOR * len(key)):
+        unique_keys = np.flatnonzero(np.bincount(key, minlength=size))
+        counts = np.bincount(key, weights=weights, minlength=size)[unique_keys]
+        first = np.full(size, len(key), dtype=np.int64)
+        np.minimum.at(first, key, np.arange(len(key)))
+        rows = first[unique_keys]
+    else:
+        _, rows, inverse, counts = np.unique(key, return_index=True, return_inverse=True, return_counts=True)
+        if weights is not None:
+            counts = np.bincount(inverse, weights=weights, minlength=len(rows))
+
+    # keys are in sorted order, reorder by first row for first-seen order
+    if not sort:
+        order = np.argsort(rows, kind='stable')
+        rows, counts = rows[order], counts[order]
+
+    if weights is None or weights.dtype.kind in 'iub':
+        counts = counts.astype(np.int64)
+
+    return [*[np.asarray(uniques)[codes[rows]] for codes, (_, uniques) in zip(codes_list, factorized)],
+            counts]
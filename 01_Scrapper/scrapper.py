@@ -6,5 +6,7 @@ import scrapper_function
 
 scrapper_function.forex_factory_scrapper(
     start_date = dt.datetime(year=2022, month=1, day=3),
-    end_date = dt.datetime(year=2023, month=5, day=13)
+    end_date = dt.datetime(year=2023, month=5, day=13),
+    cache = scrapper_function.CalendarCache(),
+    # resume = '/workspaces/Enterprise/01_Scrapper/output/FOREX_220103_230513.csv'
 )
@@ -1,19 +1,149 @@
 ''' Web scrapper to get economic data from Forex Factory.
-Returns pd.dataFrame of all economic data in a specific range '''
+Streams economic data of a specific range into a sorted csv (or SQLite) file '''
 
 # Imports
+import csv
 import datetime as dt
+import hashlib
+import heapq
+import itertools
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from numpy import arange
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 # from selenium import webdriver
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Import shared toolkit
+sys.path.append(str(Path(__file__).resolve().parents[1] / "00_Pinksheepkit"))
+from marketkit import storekit as stk
 
 # Requests web elements
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 6.1)' +
     'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/41.0.2228.0 Safari/537.36'
 }
+BASE_URL = "https://www.forexfactory.com/calendar"
+TIMEOUT = 60
+
+# Output settings
+PATH_OUTPUT = Path(__file__).resolve().parent / "output"
+HEADER = ['date', 'time', 'currency', 'impact', 'event', 'actual', 'forecast', 'previous']
+
+# Calendar HTML parsing
+CALENDAR_ROW_STRAINER = SoupStrainer(class_=re.compile(r"(^|\s)calendar_row(\s|$)"))
+CALENDAR_CELLS = ("time", "currency", "impact", "event", "actual", "forecast", "previous")
+
+# Fetch engine settings
+CONCURRENCY = 4  # Number of simultaneous requests
+RATE_LIMIT = 2.0  # Requests per second (0 = unlimited)
+RETRIES = 3  # Retry attempts on connection error or 429/5xx
+BACKOFF = 0.5  # Retry wait = BACKOFF * 2 ** (attempt - 1) seconds
+
+# Raw HTML cache settings
+CACHE_DIR = Path(__file__).resolve().parent / "cache"
+CACHE_TTL = dt.timedelta(hours=6)  # Refresh interval of recent days
+CACHE_FINAL_DAYS = 7  # Days older than this are cached forever
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing request starts to a requests-per-second cap"""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the next request slot is free"""
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class CalendarCache:
+    """On-disk cache of raw calendar pages keyed by sha1 of each day's url
+
+    Pages of days older than final_days never expire, since their actual
+    values are settled. Recent pages are refetched once older than ttl.
+    """
+
+    def __init__(self,
+                 cache_dir: Path = CACHE_DIR,
+                 ttl: dt.timedelta = CACHE_TTL,
+                 final_days: int = CACHE_FINAL_DAYS,
+                 base_url: str = BASE_URL) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.final_days = final_days
+        self.base_url = base_url
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, date: dt.datetime) -> Path:
+        """Return cache file path of given date"""
+        key = hashlib.sha1(calendar_url(date, self.base_url).encode("utf-8")).hexdigest()
+        return self.cache_dir / (key + ".html")
+
+    def get(self, date: dt.datetime) -> str:
+        """Return cached page of given date or None when missing or expired"""
+        path = self.path(date)
+        if not path.exists():
+            return None
+
+        # Recent days may still be revised -> expire after ttl
+        if date.date() > dt.date.today() - dt.timedelta(days=self.final_days):
+            age = dt.datetime.now() - dt.datetime.fromtimestamp(path.stat().st_mtime)
+            if age > self.ttl:
+                return None
+
+        return path.read_text(encoding="utf-8")
+
+    def put(self, date: dt.datetime, html: str) -> None:
+        """Store page of given date (atomic replace)"""
+        path = self.path(date)
+        temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        temp_path.write_text(html, encoding="utf-8")
+        os.replace(temp_path, path)
+
+
+def create_session(pool_size: int = CONCURRENCY,
+                   retries: int = RETRIES,
+                   backoff: float = BACKOFF) -> requests.Session:
+    """Create a pooled session with retry and exponential backoff
+
+    Args:
+        pool_size (int): number of keep-alive connections per host
+        retries (int): retry attempts on connection error or 429/5xx
+        backoff (float): backoff factor between retries
+
+    Returns:
+        requests.Session: session shared by every fetch
+    """
+
+    retry = Retry(total=retries,
+                  backoff_factor=backoff,
+                  status_forcelist=[429, 500, 502, 503, 504],
+                  allowed_methods=["GET"])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.headers.update(headers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
 
 
 def handle_time(time: str) -> tuple:
@@ -36,11 +166,104 @@ def handle_time(time: str) -> tuple:
         return str(int(time.split(":")[0]) + 11) + ":" + str(time.split(":")[1][:-2]), 0
 
 
-def scrapper(date: str) -> list():  # Date format: mmmd.yyyy
+def calendar_url(date: dt.datetime, base_url: str = BASE_URL) -> str:
+    """Return Forex Factory calendar url of given date (day=mmmd.yyyy)"""
+
+    fdate = date.strftime("%b").lower() + date.strftime("%d").lstrip("0") + date.strftime(".%Y")
+    return base_url + "?day=" + fdate
+
+
+def fetch_calendar(date: dt.datetime,
+                   session: requests.Session = None,
+                   limiter: RateLimiter = None,
+                   base_url: str = BASE_URL) -> str:
+    """Return raw calendar HTML of given date
+
+    Args:
+        date (dt.datetime): date for fetching data
+        session (requests.Session): pooled session, a new one is created if None
+        limiter (RateLimiter): shared rate limiter, unlimited if None
+        base_url (str): calendar url without query string
+
+    Returns:
+        str: calendar page HTML
+    """
+
+    if session is None:
+        session = create_session(pool_size=1)
+    if limiter is not None:
+        limiter.wait()
+
+    response = session.get(calendar_url(date, base_url), timeout=TIMEOUT)
+    response.raise_for_status()
+
+    return response.text
+
+
+def fetch_calendars(dates: list,
+                    concurrency: int = CONCURRENCY,
+                    rate: float = RATE_LIMIT,
+                    base_url: str = BASE_URL,
+                    cache: CalendarCache = None):
+    """Fetch calendar HTML of many dates concurrently
+
+    Args:
+        dates (list): list of dt.datetime
+        concurrency (int): number of simultaneous requests
+        rate (float): requests per second cap (0 = unlimited)
+        base_url (str): calendar url without query string
+        cache (CalendarCache): raw HTML cache, pages are always fetched if None
+
+    Yields:
+        tuple(dt.datetime, str): (date, calendar page HTML) in the order of dates
+    """
+
+    session = create_session(pool_size=concurrency)
+    limiter = RateLimiter(rate)
+
+    def fetch(date):
+        if cache is not None:
+            html = cache.get(date)
+            if html is not None:
+                return html
+
+        html = fetch_calendar(date, session=session, limiter=limiter, base_url=base_url)
+
+        # Store each page as soon as it arrives so a failed run can be resumed
+        if cache is not None:
+            cache.put(date, html)
+
+        return html
+
+    with session, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        yield from zip(dates, executor.map(fetch, dates))
+
+
+def scrapper(date: dt.datetime, session: requests.Session = None, base_url: str = BASE_URL) -> list:
     """Return table of economic data of given date
 
     Args:
-        date (str): date for fetching data
+        date (dt.datetime): date for fetching data
+        session (requests.Session): pooled session, a new one is created if None
+        base_url (str): calendar url without query string
+
+    Returns:
+        list of data: column name: [
+            index,date,time,currency,impact,event,actual,forecast,previous
+        ]
+    """
+
+    html = fetch_calendar(date, session=session, base_url=base_url)
+
+    return parse_calendar(html, date)
+
+
+def parse_calendar_tree(html: str, date: dt.datetime) -> list:
+    """Parse calendar page HTML into table of economic data by walking the full soup tree
+
+    Args:
+        html (str): calendar page HTML
+        date (dt.datetime): date of the calendar page
 
     Returns:
         list of data: column name: [
@@ -48,14 +271,6 @@ def scrapper(date: str) -> list():  # Date format: mmmd.yyyy
         ]
     """
 
-    fdate = date.strftime("%b").lower() + date.strftime("%d").lstrip("0") + date.strftime(".%Y")
-    url = "https://www.forexfactory.com/calendar?day=" + fdate
-    response = requests.get(
-        url,
-        timeout=1000,
-        headers=headers)
-    html = response.text
-    
     # dr = webdriver.Chrome()
     # dr.get(url)
 
@@ -114,59 +329,348 @@ def scrapper(date: str) -> list():  # Date format: mmmd.yyyy
     return array
 
 
-def forex_factory_scrapper(start_date: dt.datetime, end_date: dt.datetime) -> None:
+def parse_calendar(html: str, date: dt.datetime) -> list:
+    """Parse calendar page HTML into table of economic data in a single pass
+
+    Only <tr class='calendar_row'> tags are built into the soup, then each row
+    is walked once to collect its cells. Output is the same as parse_calendar_tree.
+
+    Args:
+        html (str): calendar page HTML
+        date (dt.datetime): date of the calendar page
+
+    Returns:
+        list of data: column name: [
+            index,date,time,currency,impact,event,actual,forecast,previous
+        ]
+    """
+
+    # Economic data are stored in <tr class='calendar_row'>{data}</tr> tag
+    table_rows = BeautifulSoup(html, "html.parser", parse_only=CALENDAR_ROW_STRAINER).find_all(
+        class_="calendar_row")
+
+    # 2D array storing all processed economic data
+    array = []
+
+    for row in table_rows:
+        # Collect first tag of each column class in one walk over the row
+        cells = {}
+        for tag in row.find_all(True):
+            for cell_class in tag.get("class", ()):
+                if (cell_class in CALENDAR_CELLS) and (cell_class not in cells):
+                    cells[cell_class] = tag
+
+        # Rows without exactly one currency string end the table (day breakers, footer)
+        currency = list(cells["currency"].stripped_strings) if "currency" in cells else []
+        if len(currency) != 1:
+            break
+
+        columns = []
+        timesig = handle_time(cells["time"].contents[1].contents[0].lstrip('\n'))
+        columns.append((date + dt.timedelta(days=timesig[1])).strftime("%a, %d %b %y"))
+        columns.append(timesig[0])
+        columns.append(currency[0])
+        columns.append(cells["impact"].contents[1].get('title').split(" ")[0])
+        columns.append(cells["event"].contents[1].contents[1].contents[0])
+
+        actual = cells["actual"].find_all('span')
+        columns.append(actual[0].get_text() if len(actual) > 0 else None)
+
+        forecast = cells["forecast"].find_all('span')
+        if (len(forecast) > 0) and (forecast[0].contents[0] != '\xa0'):
+            columns.append(forecast[0].contents[0])
+        else:
+            columns.append(None)
+
+        previous = cells["previous"].find_all('span')
+        if len(previous) > 0:
+            revised = [span for span in previous if 'revised' in span.get("class", ())]
+            if len(revised) > 0:
+                columns.append(revised[0].contents[0])
+            elif '\xa0' in previous[0].contents[0]:
+                columns.append(None)
+            else:
+                columns.append(previous[0].contents[0].split(' ')[-5])
+        else:
+            columns.append(None)
+
+        array.append(columns)
+
+    return array
+
+
+def benchmark_parse_calendar(pages: list, repeat: int = 3) -> dict:
+    """Compare parse throughput of parse_calendar_tree and parse_calendar
+
+    Args:
+        pages (list): list of tuple(calendar page HTML, dt.datetime),
+            i.e. saved pages of tests/fixtures/forexfactory (see tests/conftest.py)
+        repeat (int): number of passes over pages
+
+    Returns:
+        dict: {parser name: pages per second}
+    """
+
+    result = {}
+    for parser in (parse_calendar_tree, parse_calendar):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for html, date in pages:
+                parser(html, date)
+        result[parser.__name__] = len(pages) * repeat / (time.perf_counter() - start)
+
+        # Print log
+        print(f'{parser.__name__:<20}  {result[parser.__name__]:8.1f} pages/s')
+
+    return result
+
+
+def missing_dates(start_date: dt.datetime, end_date: dt.datetime, path_csv: str) -> list:
+    """Return dates in [start_date, end_date) that have no row in existing FOREX csv
+
+    Args:
+        start_date (dt.datetime): start date
+        end_date (dt.datetime): end date (exclusive)
+        path_csv (str): path of existing FOREX_*.csv file
+
+    Returns:
+        list of dt.datetime: dates to be fetched
+    """
+
+    df_existing = pd.read_csv(path_csv, usecols=['date'])
+    existing_dates = set(pd.to_datetime(df_existing['date']).dt.date)
+
+    return [start_date + dt.timedelta(days=day) for day in range((end_date - start_date).days)
+            if (start_date + dt.timedelta(days=day)).date() not in existing_dates]
+
+
+def iter_forex_factory(dates: list,
+                       concurrency: int = CONCURRENCY,
+                       rate: float = RATE_LIMIT,
+                       base_url: str = BASE_URL,
+                       cache: CalendarCache = None):
+    """Fetch and parse calendar of each date lazily
+
+    Args:
+        dates (list): list of dt.datetime
+        concurrency (int): number of simultaneous requests
+        rate (float): requests per second cap (0 = unlimited)
+        base_url (str): calendar url without query string
+        cache (CalendarCache): raw HTML cache, pages are always fetched if None
+
+    Yields:
+        tuple(dt.datetime, list): (date, rows with ISO date 'YYYY-MM-DD') in the order of dates
+    """
+
+    PAGES = fetch_calendars(dates, concurrency=concurrency, rate=rate,
+                            base_url=base_url, cache=cache)
+    for DATE, HTML in PAGES:
+        ROWS = parse_calendar(HTML, DATE)
+        for row in ROWS:
+            row[0] = dt.datetime.strptime(row[0], "%a, %d %b %y").strftime("%Y-%m-%d")
+        yield DATE, ROWS
+
+
+class CSVSink:
+    """Append-only csv sink merged into a date-sorted csv on close
+
+    Rows are appended to {name}.part.csv and flushed per write, so progress
+    survives a crash: a part file left by a crashed run is kept and appended
+    to, and dates() tells the scrapper which days it already holds. close()
+    runs an external merge sort: the part file is cut into sorted runs of
+    chunk_size rows, then the runs are merged by date (descending) with
+    duplicates dropped, never holding more than one chunk in memory.
+    """
+
+    def __init__(self, path_output: Path, name: str, chunk_size: int = 100000) -> None:
+        self.path = Path(path_output) / (name + ".csv")
+        self.part_path = Path(path_output) / (name + ".part.csv")
+        self.chunk_size = chunk_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Cut a row torn by a crash mid-write before appending to the part file
+        if self.part_path.exists():
+            with open(self.part_path, "rb+") as part_file:
+                content = part_file.read()
+                part_file.truncate(content.rfind(b"\n") + 1)
+
+        self.file = open(self.part_path, "a", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+
+    def write(self, rows: list) -> None:
+        """Append rows [date, time, currency, impact, event, actual, forecast, previous]"""
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def dates(self) -> set:
+        """ISO dates already held by the part file, but the last written one
+
+        The last date may have been cut short by a crash, so it is fetched
+        again; its repeated rows are dropped on close.
+        """
+        self.file.flush()
+        with open(self.part_path, newline="", encoding="utf-8") as part_file:
+            dates = list(dict.fromkeys(row[0] for row in csv.reader(part_file)))
+        return set(dates[:-1])
+
+    def close(self) -> Path:
+        """Merge part file into final csv and return its path"""
+        self.file.close()
+
+        # Cut part file into sorted runs
+        run_paths = []
+        with open(self.part_path, newline="", encoding="utf-8") as part_file:
+            reader = csv.reader(part_file)
+            while True:
+                chunk = list(itertools.islice(reader, self.chunk_size))
+                if len(chunk) == 0:
+                    break
+                chunk.sort(key=lambda row: row[0], reverse=True)
+                run_path = self.part_path.with_suffix(f".{len(run_paths)}.run")
+                with open(run_path, "w", newline="", encoding="utf-8") as run_file:
+                    csv.writer(run_file).writerows(chunk)
+                run_paths.append(run_path)
+
+        # Merge runs by date and drop duplicated rows within each date
+        run_files = [open(run_path, newline="", encoding="utf-8") for run_path in run_paths]
+        try:
+            with open(self.path, "w", newline="", encoding="utf-8") as out_file:
+                writer = csv.writer(out_file)
+                writer.writerow([""] + HEADER)
+                index = 0
+                current_date, seen = None, set()
+                for row in heapq.merge(*map(csv.reader, run_files), key=lambda row: row[0], reverse=True):
+                    if row[0] != current_date:
+                        current_date, seen = row[0], set()
+                    if tuple(row) in seen:
+                        continue
+                    seen.add(tuple(row))
+                    writer.writerow([index] + row)
+                    index += 1
+        finally:
+            for run_file in run_files:
+                run_file.close()
+
+        for run_path in run_paths:
+            run_path.unlink()
+        self.part_path.unlink()
+
+        return self.path
+
+
+class SQLiteSink:
+    """Append-only SQLite sink, committed per write so progress survives a crash"""
+
+    def __init__(self, path_output: Path, name: str, table: str = "forex") -> None:
+        self.path = Path(path_output) / (name + ".sqlite")
+        self.table = table
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ({', '.join(HEADER)})")
+
+    def dates(self) -> set:
+        """ISO dates already stored, i.e. by an earlier run that crashed before close"""
+        return {date for (date,) in self.connection.execute(f"SELECT DISTINCT date FROM {self.table}")}
+
+    def write(self, rows: list) -> None:
+        """Append rows [date, time, currency, impact, event, actual, forecast, previous]"""
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO {self.table} VALUES ({', '.join('?' * len(HEADER))})",
+                [[None if value is None else str(value) for value in row] for row in rows])
+
+    def close(self) -> Path:
+        """Drop duplicated rows, index by date and return database path"""
+        with self.connection:
+            self.connection.execute(
+                f"DELETE FROM {self.table} WHERE rowid NOT IN "
+                f"(SELECT MIN(rowid) FROM {self.table} GROUP BY {', '.join(HEADER)})")
+            self.connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_date ON {self.table} (date)")
+        self.connection.close()
+
+        return self.path
+
+
+def forex_factory_scrapper(start_date: dt.datetime,
+                           end_date: dt.datetime,
+                           concurrency: int = CONCURRENCY,
+                           rate: float = RATE_LIMIT,
+                           base_url: str = BASE_URL,
+                           cache: CalendarCache = None,
+                           resume: str = None,
+                           path_output: str = PATH_OUTPUT,
+                           sink: object = None) -> Path:
     """Scrap financial data from FOREX factory website
 
     Args:
         start_date (dt.datetime): start date
         end_date (dt.datetime): end date
-        
+        concurrency (int): number of simultaneous requests
+        rate (float): requests per second cap (0 = unlimited)
+        base_url (str): calendar url without query string
+        cache (CalendarCache): raw HTML cache, pages are always fetched if None
+        resume (str): path of existing FOREX_*.csv, only days missing from it are fetched
+        path_output (str): folder of output file
+        sink (CSVSink | SQLiteSink): output sink, CSVSink of FOREX_{start}_{end} if None.
+            Days the sink already holds from a crashed run are not fetched again
+
     Returns:
-        csv file (.csv): column name: [
+        Path of output file (.csv): column name: [
             index,date,time,currency,impact,event,actual,forecast,previous
         ]
     """
 
     DAYS = (end_date - start_date).days
-    
-    # Check interval is lesser than 10000
-    LIMIT_DAYS = 9999
-    if DAYS > LIMIT_DAYS:
-        # Print log
-        print(f"ERROR: TOO LONG DATE INTERVAL: {DAYS} expected {LIMIT_DAYS}")
-        return 1
-    
-    FETCH_DATA = []
+
+    # Open output sink
+    FILE_NAME = 'FOREX_' + start_date.strftime("%y%m%d") + '_' + end_date.strftime("%y%m%d")
+    if sink is None:
+        sink = CSVSink(path_output, FILE_NAME)
 
     # Print log
     print("START FETCHING DATA FROM FOREX FACTORY")
     print("--------------------------------------")
     print("#     DATE         COUNT")
-    
-    # Loop scrap data of each day
-    for step in arange(1, DAYS):
-        DATE = start_date + dt.timedelta(days=int(step)-1)
-        SCRAP = scrapper(DATE)
-        FETCH_DATA.extend(SCRAP)
-        
+
+    DATES = [start_date + dt.timedelta(days=int(step)-1) for step in arange(1, DAYS)]
+
+    # Skip days left in the sink by a crashed run
+    SINK_DATES = sink.dates()
+    DATES = [DATE for DATE in DATES if DATE.strftime("%Y-%m-%d") not in SINK_DATES]
+
+    # Carry rows of existing csv over in resume mode
+    if resume is not None:
+        MISSING_DATES = set(missing_dates(start_date, end_date, resume))
+        DATES = [DATE for DATE in DATES if DATE in MISSING_DATES]
+        with open(resume, newline="", encoding="utf-8") as resume_file:
+            reader = csv.reader(resume_file)
+            next(reader)  # Header
+            for chunk in iter(lambda: list(itertools.islice(reader, 10000)), []):
+                sink.write([[value if value != "" else None for value in row[1:]]
+                            for row in chunk if row[1] not in SINK_DATES])
+
+    # Fetch pages concurrently and stream rows of each day to sink in date order
+    COUNT = 0
+    for step, (DATE, SCRAP) in enumerate(iter_forex_factory(
+            DATES, concurrency=concurrency, rate=rate, base_url=base_url, cache=cache), start=1):
+        sink.write(SCRAP)
+        COUNT += len(SCRAP)
+
         # Print log
         print(f'{step:04}  {DATE.strftime("%b %d %Y")}  {str(len(SCRAP))}')
 
-    # Convert to pd.DataFrame with some cleaning
-    HEADER = ['date', 'time', 'currency', 'impact', 'event', 'actual', 'forecast', 'previous']
-    DF_DATA = pd.DataFrame(FETCH_DATA, columns=HEADER)
-    DF_DATA['date'] = pd.to_datetime(DF_DATA['date'], format='%a, %d %b %y')
-    DF_DATA.sort_values(by=['date'], inplace=True, ascending=False)
-    DF_DATA.reset_index(inplace=True, drop=True)
+    # Sort and drop duplicates
+    PATH = sink.close()
 
-    print(DF_DATA)
-
-    # Import to csv file
-    FILE_NAME = 'FOREX_' + start_date.strftime("%y%m%d") + '_' + end_date.strftime("%y%m%d")
-    DF_DATA.to_csv('/workspaces/Enterprise/01_Scrapper/output/' + FILE_NAME + '.csv', 
-                   sep=',', 
-                   encoding='utf-8')
+    # Export typed store next to csv (written after csv so loaders treat it as fresh)
+    if PATH.suffix == '.csv':
+        stk.write_store(stk.read_events_csv(PATH), PATH.with_suffix(stk.STORE_SUFFIX))
 
     # Print log
+    print(f'{COUNT} rows fetched -> {PATH}')
     print('SUCCESSFULLY FETCH DATA')
     print('-----------------------')
+
+    return PATH
@@ -1,19 +1,122 @@
 """Essential functions for reading candlestick images
 
     Functions:
-    1. highlight_candlestick(img_list: list) -> dict
-    2. interpret_candlestick(candlestick_polymerase: dict, initial_time: tuple) -> dict
-    3. calibrate_candlestick(candlestick: dict, **calibrated_candlestick_param) -> dict
-    4. candlestick_reader(path_input: str, img_input: list, csv_input: str) -> dict
+    1. ImageBuffer.load(path: str, crop_box: tuple) -> tuple
+    2. highlight_candlestick_channels(red: np.ndarray, green: np.ndarray) -> tuple
+    3. highlight_candlestick_array(img_array: np.ndarray) -> tuple
+    4. highlight_candlestick(img_list: list) -> dict
+    5. segment_candlestick(count: np.ndarray, lowest_point: np.ndarray) -> np.ndarray
+    6. interpret_candlestick(candlestick_polymerase: tuple, initial_time: tuple) -> pd.DataFrame
+    7. calibrate_candlestick(candlestick: pd.DataFrame, calibrated_candlestick_values: pd.Series) -> tuple
+    8. read_candlestick_image(path_input: str, img_file: str, csv_row: pd.Series, excluded_time: np.ndarray) -> tuple
+    9. candlestick_reader(path_input: str, img_input: list, csv_input: str) -> dict
     
 """
 
 # Import libraries
+import sys
 import numpy as np
 import pandas as pd
 import datetime as dt
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image
 
+# Import shared toolkit
+sys.path.append(str(Path(__file__).resolve().parents[1] / "00_Pinksheepkit"))
+from marketkit import calendarkit as calk
+from marketkit import storekit as stk
+
+
+class ImageBuffer:
+    """Reusable uint8 buffer holding only R and G channels of decoded images
+
+    PIL decodes each image into its own memory and each channel is copied
+    out of it (getchannel, np.asarray), so nothing is decoded in place: the
+    buffer only caps steady-state memory. It grows to the largest image seen
+    and is reused afterwards, and only R and G are kept, so memory per
+    process scales with the image instead of Python objects.
+    """
+
+    def __init__(self) -> None:
+        self.data = np.empty(0, dtype=np.uint8)
+
+    def load(self, path: str, crop_box: tuple = None) -> tuple:
+        """Decode image and copy its R and G channels into the buffer
+
+        Args:
+            path (str): image file path
+            crop_box (tuple): plot region (left, upper, right, lower) in pixel, whole image if None
+
+        Returns:
+            tuple(np.ndarray, np.ndarray): (red, green) 2D uint8 views of the buffer
+        """
+
+        with Image.open(path) as IMG:
+            if IMG.mode not in ("RGB", "RGBA"):
+                IMG = IMG.convert("RGB")
+            if crop_box is not None:
+                IMG = IMG.crop(crop_box)
+
+            width, height = IMG.size
+            if self.data.size < 2 * height * width:
+                self.data = np.empty(2 * height * width, dtype=np.uint8)
+            CHANNELS = self.data[:2 * height * width].reshape(2, height, width)
+
+            for channel, band in enumerate(("R", "G")):
+                CHANNELS[channel] = np.asarray(IMG.getchannel(band))
+
+        return CHANNELS[0], CHANNELS[1]
+
+
+# Image buffer of this process (each worker process holds its own)
+IMAGE_BUFFER = ImageBuffer()
+
+
+def highlight_candlestick_channels(red: np.ndarray, green: np.ndarray) -> tuple:
+    """Recognize bull and bear candlestick over the whole image at once
+        Bull -> R - G < -10 & R + G > 200 -> +1
+        Bear -> R - G > 10 & R + G > 200 -> -1
+
+        Parameters:
+        1. red = 2D array of R channel (height, width)
+        2. green = 2D array of G channel (height, width)
+
+        Output:
+        1. count = 1D array of net +1/-1 score of each column
+        2. lowest_point = 1D array of lowest point that contain +1/-1 of each column
+            (0 when the column has no candlestick pixel)
+    """
+
+    # Compute in int16 so that R + G and R - G do not overflow uint8
+    bright = np.add(red, green, dtype=np.int16) > 200
+    difference = np.subtract(red, green, dtype=np.int16)
+    bull = bright & (difference < -10)
+    bear = bright & (difference > 10)
+
+    count = bull.sum(axis=0) - bear.sum(axis=0)
+
+    # Lowest hit row of each column = last hit row scanning from the top
+    hit = bull | bear
+    height, width = hit.shape
+    last_row = height - 1 - np.argmax(hit[::-1, :], axis=0)
+    lowest_point = np.where(hit.any(axis=0), width - last_row - 1, 0)
+
+    return count, lowest_point
+
+
+def highlight_candlestick_array(img_array: np.ndarray) -> tuple:
+    """Recognize bull and bear candlestick over the whole image at once
+
+        Parameters:
+        1. img_array = 3D array of image pixels (height, width, channel)
+
+        Output:
+        1. count, lowest_point of each column (see highlight_candlestick_channels)
+    """
+
+    return highlight_candlestick_channels(img_array[:, :, 0], img_array[:, :, 1])
+
 
 def highlight_candlestick(img_list: list) -> dict:
     """Recognize bull and bear candlestick
@@ -22,7 +125,7 @@ def highlight_candlestick(img_list: list) -> dict:
         Store [count of +1/-1 score, lowest point that contain +1/-1] of each column
 
         Parameters:
-        1. img_list = 3D list of image pixels (jpeg: rgb, png: rgba)
+        1. img_list = 3D list or array of image pixels (jpeg: rgb, png: rgba)
 
         Output:
         1. CANDLESTICK POLYMERASE = dict(pixel no. horizontally: 
@@ -30,141 +133,126 @@ def highlight_candlestick(img_list: list) -> dict:
             lowest point that contain +1/-1 of each column)
     """
 
-    CANDLESTICK_POLYMERASE = {}  # {w: [count, lowest_point]}
-    for h in np.arange(len(img_list)):
-        for w in np.arange(len(img_list[h])):
-            r = img_list[h][w][0]
-            g = img_list[h][w][1]
-            if (r + g > 200) & (r - g < -10):
-                if w in CANDLESTICK_POLYMERASE:
-                    CANDLESTICK_POLYMERASE[w][0] += 1
-                    CANDLESTICK_POLYMERASE[w][1] = len(img_list[h]) - h - 1
-                else:
-                    CANDLESTICK_POLYMERASE[w] = [1, len(img_list[h]) - h - 1]
-            elif (r + g > 200) & (r - g > 10):
-                if w in CANDLESTICK_POLYMERASE:
-                    CANDLESTICK_POLYMERASE[w][0] -= 1
-                    CANDLESTICK_POLYMERASE[w][1] = len(img_list[h]) - h - 1
-                else:
-                    CANDLESTICK_POLYMERASE[w] = [-1, len(img_list[h]) - h - 1]
-            else:
-                if w not in CANDLESTICK_POLYMERASE:
-                    CANDLESTICK_POLYMERASE[w] = [0, 0]
-
-    # Sort CANDLESTICK_POLYMERASE keys
-    CANDLESTICK_POLYMERASE = ({k: v for k, v in sorted(
-        CANDLESTICK_POLYMERASE.items(), key=lambda item: item[0])})
+    count, lowest_point = highlight_candlestick_array(np.asarray(img_list))
+
+    CANDLESTICK_POLYMERASE = {w: [int(c), int(l)] for w, (c, l) in enumerate(
+        zip(count, lowest_point))}  # {w: [count, lowest_point]}
 
     return CANDLESTICK_POLYMERASE
 
 
-def interpret_candlestick(candlestick_polymerase: dict, initial_time: dt.datetime, excluded_time: list) -> dict:
+def segment_candlestick(count: np.ndarray, lowest_point: np.ndarray) -> np.ndarray:
+    """Segment columns into candles and compute pixel open, high, low, close of each candle
+        Candle = run of consecutive columns with count != 0
+        Open/close come from the first column of the run, high/low from the last
+        column whose high/low differ from the first column (first column if none)
+
+        Parameters:
+        1. count = 1D array of net +1/-1 score of each column
+        2. lowest_point = 1D array of lowest point that contain +1/-1 of each column
+
+        Output:
+        1. OHLC = 2D array (candles, [open, high, low, close]) in pixel
+    """
+
+    # Columns containing candle and first column of each run
+    columns = np.flatnonzero(count)
+    if len(columns) == 0:
+        return np.empty((0, 4), dtype=np.int64)
+    is_start = np.r_[True, np.diff(columns) > 1]
+    start = np.flatnonzero(is_start)
+    run = np.cumsum(is_start) - 1
+
+    column_count = count[columns]
+    column_low = lowest_point[columns]
+
+    # Bull run stacks pixels above lowest point, bear run below the top
+    sign = np.sign(column_count[start])
+    column_high = column_low + sign[run] * column_count
+
+    # Last column of each run which differs from the first column
+    differ = (column_high != column_high[start][run]) | (column_low != column_low[start][run])
+    last_differ = np.maximum.reduceat(np.where(differ, np.arange(len(columns)), -1), start)
+    chosen = np.where(last_differ >= 0, last_differ, start)
+
+    first_count = column_count[start]
+    first_low = column_low[start]
+    bull = sign > 0
+
+    return np.column_stack([np.where(bull, first_low, first_low - first_count),
+                            column_high[chosen],
+                            column_low[chosen],
+                            np.where(bull, first_low + first_count, first_low)])
+
+
+def interpret_candlestick(candlestick_polymerase: tuple, initial_time: dt.datetime, excluded_time: np.ndarray) -> pd.DataFrame:
     """Interpret candlestick pixel value (open, high, low, close)
 
     Parameters:
-    1. candlestick_polymerase = dict(pixel no. horizontally: 
-        count of +1/-1 score, 
-        lowest point that contain +1/-1 of each column)
+    1. candlestick_polymerase = tuple(count of +1/-1 score of each column,
+        lowest point that contain +1/-1 of each column) from highlight_candlestick_array
+    2. initial_time = time of the first candlestick
+    3. excluded_time = array-like of holidays or other excluded time
 
     Output:
-    1. CANDLESTICK = dict(date (datetime64: YY MM DD HH mm):
-        open: float,
-        high: float,
-        low: float,
-        close: float)
+    1. CANDLESTICK = pd.DataFrame(index: time (datetime64: YY MM DD HH mm),
+        columns: open, high, low, close)
 """
 
-    CANDLESTICK = {}  # {date: [open, high, low, close]}
-
-    # Manage datetime
-    # datetime(year, month, day, hour, minute, second)
-    DELTA_TIME = dt.timedelta(hours=1)
-
-    def next_datetime(time: dt.datetime, excluded_time=excluded_time, dt=DELTA_TIME):
-        """Forward candlestick time"""
-        while True:
-            time += dt
-            if time in excluded_time:
-                continue
-            # XAU market close -> [SAT 05.00 - MON 04.00]
-            if (time.weekday() in [1, 2, 3, 4]) | ((time.weekday() == 5) & (time.hour < 5)) | ((time.weekday() == 0) & (time.hour > 4)):
-                break
-        return time
-
-    candle_time = initial_time
-    position = 0
-
-    while position < len(candlestick_polymerase):
-        # Find candle (count != 0)
-        if candlestick_polymerase[position][0] > 0:  # Bullish candle
-            CANDLESTICK[candle_time] = {"open": candlestick_polymerase[position][1],
-                                        "high": candlestick_polymerase[position][1] + candlestick_polymerase[position][0],
-                                        "low": candlestick_polymerase[position][1],
-                                        "close": candlestick_polymerase[position][1] + candlestick_polymerase[position][0]}
-            position += 1
-            temp_high = CANDLESTICK[candle_time]["high"]
-            temp_low = CANDLESTICK[candle_time]["low"]
-            while position < len(candlestick_polymerase):
-                if candlestick_polymerase[position][0] == 0:
-                    break
-                if (temp_high != candlestick_polymerase[position][1] + candlestick_polymerase[position][0]) | (temp_low != candlestick_polymerase[position][1]):
-                    CANDLESTICK[candle_time]["high"] = candlestick_polymerase[position][1] + \
-                        candlestick_polymerase[position][0]
-                    CANDLESTICK[candle_time]["low"] = candlestick_polymerase[position][1]
-                position += 1
-            candle_time = next_datetime(candle_time)
-        elif candlestick_polymerase[position][0] < 0:  # Bearish candle
-            CANDLESTICK[candle_time] = {"open": candlestick_polymerase[position][1] - candlestick_polymerase[position][0],
-                                        "high": candlestick_polymerase[position][1] - candlestick_polymerase[position][0],
-                                        "low": candlestick_polymerase[position][1],
-                                        "close": candlestick_polymerase[position][1]}
-            position += 1
-            temp_high = CANDLESTICK[candle_time]["high"]
-            temp_low = CANDLESTICK[candle_time]["low"]
-            while position < len(candlestick_polymerase):
-                if candlestick_polymerase[position][0] == 0:
-                    break
-                if (temp_high != candlestick_polymerase[position][1] - candlestick_polymerase[position][0]) | (temp_low != candlestick_polymerase[position][1]):
-                    CANDLESTICK[candle_time]["high"] = candlestick_polymerase[position][1] - \
-                        candlestick_polymerase[position][0]
-                    CANDLESTICK[candle_time]["low"] = candlestick_polymerase[position][1]
-                position += 1
-            candle_time = next_datetime(candle_time)
-        position += 1
+    OHLC = segment_candlestick(*candlestick_polymerase)
+
+    # Assign candle times from precomputed trading calendar
+    CANDLE_TIME = calk.next_trading_hours(initial_time, len(OHLC), excluded_time)
+
+    CANDLESTICK = pd.DataFrame(OHLC, columns=["open", "high", "low", "close"],
+                               index=pd.DatetimeIndex(CANDLE_TIME.astype("datetime64[ns]"), name="time"))
 
     return CANDLESTICK
 
 
-def calibrate_candlestick(candlestick: dict, calibrated_candlestick_values: dict) -> dict:
-    """Calibrate candlesitck value by calculate pixels to price"""
-
-    # Get non-calibrated price from candlestick
-    non_calibrated_value = candlestick[calibrated_candlestick_values["calibrated_time"].to_pydatetime(
-    )]
-    candle_price_per_pixel = abs(calibrated_candlestick_values["calibrated_open"] - calibrated_candlestick_values["calibrated_close"]) / \
-        abs(non_calibrated_value["open"] - non_calibrated_value["close"])
-    wick_price_per_pixel = abs(calibrated_candlestick_values["calibrated_high"] - calibrated_candlestick_values["calibrated_low"]) / \
-        abs(non_calibrated_value["high"] - non_calibrated_value["low"])
-    price_per_pixel = (candle_price_per_pixel + wick_price_per_pixel) / 2
-
-    # Calculate price
-    def calibrate_price(pixel: float,
-                        price_per_pixel=price_per_pixel,
-                        exp_pixel=non_calibrated_value["open"],
-                        exp_price=calibrated_candlestick_values["calibrated_open"]) -> float:
-        """Calculate price from pixel"""
-
-        return exp_price - ((exp_pixel-pixel)*price_per_pixel)
-
-    for candlestick_date in candlestick.keys():
-        candlestick[candlestick_date]["open"] = round(
-            calibrate_price(candlestick[candlestick_date]["open"]), 2)
-        candlestick[candlestick_date]["high"] = round(
-            calibrate_price(candlestick[candlestick_date]["high"]), 2)
-        candlestick[candlestick_date]["low"] = round(
-            calibrate_price(candlestick[candlestick_date]["low"]), 2)
-        candlestick[candlestick_date]["close"] = round(
-            calibrate_price(candlestick[candlestick_date]["close"]), 2)
+def calibrate_candlestick(candlestick: pd.DataFrame,
+                          calibrated_candlestick_values: pd.Series,
+                          least_squares: bool = True) -> tuple:
+    """Calibrate candlesitck value by calculate pixels to price
+
+    Parameters:
+    1. candlestick = pd.DataFrame of pixel open, high, low, close indexed by time
+    2. calibrated_candlestick_values = reference candle [calibrated_time, calibrated_open,
+        calibrated_high, calibrated_low, calibrated_close] as pd.Series,
+        or several reference candles as pd.DataFrame rows
+    3. least_squares = fit pixel -> price line over all reference prices
+        when more than one reference candle is given
+
+    Output:
+    1. tuple(pd.DataFrame of calibrated price, None or (error, candle_price_per_pixel, wick_price_per_pixel))
+    """
+
+    REFERENCE = pd.DataFrame(calibrated_candlestick_values).T \
+        if isinstance(calibrated_candlestick_values, pd.Series) else calibrated_candlestick_values
+
+    # Get non-calibrated (pixel) and calibrated (price) values of reference candles
+    # Columns: [open, high, low, close]
+    OHLC = candlestick[["open", "high", "low", "close"]].to_numpy(dtype=np.float64)
+    PIXEL = candlestick.loc[pd.DatetimeIndex(REFERENCE["calibrated_time"]),
+                            ["open", "high", "low", "close"]].to_numpy(dtype=np.float64)
+    PRICE = REFERENCE[["calibrated_open", "calibrated_high",
+                       "calibrated_low", "calibrated_close"]].to_numpy(dtype=np.float64)
+
+    candle_price_per_pixel = float(np.abs(PRICE[:, 0] - PRICE[:, 3]).sum() /
+                                   np.abs(PIXEL[:, 0] - PIXEL[:, 3]).sum())
+    wick_price_per_pixel = float(np.abs(PRICE[:, 1] - PRICE[:, 2]).sum() /
+                                 np.abs(PIXEL[:, 1] - PIXEL[:, 2]).sum())
+
+    # Calculate price = exp_price - (exp_pixel - pixel) * price_per_pixel
+    if least_squares & (len(REFERENCE) > 1):
+        price_per_pixel, intercept = np.polyfit(PIXEL.ravel(), PRICE.ravel(), deg=1)
+        CALIBRATED_OHLC = intercept + OHLC * price_per_pixel
+    else:
+        price_per_pixel = (candle_price_per_pixel + wick_price_per_pixel) / 2
+        CALIBRATED_OHLC = PRICE[0, 0] - ((PIXEL[0, 0] - OHLC) * price_per_pixel)
+
+    candlestick = pd.DataFrame(np.round(CALIBRATED_OHLC, 2), index=candlestick.index,
+                               columns=["open", "high", "low", "close"])
 
     # Error should be less than 1%
     error = abs(candle_price_per_pixel - wick_price_per_pixel) * \
@@ -175,13 +263,69 @@ def calibrate_candlestick(candlestick: dict, calibrated_candlestick_values: dict
     return (candlestick, None)
 
 
+def read_candlestick_image(path_input: str,
+                           img_file: str,
+                           csv_row: pd.Series,
+                           excluded_time: np.ndarray,
+                           crop_box: tuple = None) -> tuple:
+    """Run load -> highlight -> interpret -> calibrate pipeline on one image
+
+    Args:
+        path_input (str): path of image folder
+        img_file (str): image file name
+        csv_row (pd.Series): row of candlestick parameters paired with the image
+            [first_time, last_time, calibrated_time, calibrated_open,
+            calibrated_high, calibrated_low, calibrated_close]
+        excluded_time (np.ndarray): holidays or other excluded time
+        crop_box (tuple): plot region (left, upper, right, lower) in pixel, whole image if None
+
+    Returns:
+        tuple(str, pd.DataFrame, list): (image file name,
+            DataFrame of calibrated candlesticks, list of log messages)
+    """
+
+    LOG = [f"Processing Image {img_file}"]
+
+    # Copy R and G channels of the decoded image into reused buffer
+    RED, GREEN = IMAGE_BUFFER.load(str(path_input) + str(img_file), crop_box)
+
+    CANDLESTICK_POLYMERASE = highlight_candlestick_channels(RED, GREEN)
+    CANDLESTICK = interpret_candlestick(
+        CANDLESTICK_POLYMERASE, csv_row.iloc[0], excluded_time)
+
+    # Check last candlestick
+    if CANDLESTICK.index[-1] != csv_row.iloc[1]:
+        LOG.append("Error: Last candlestick date ({0} to {1}) is not corresponded to CSV ({2})".format(
+            CANDLESTICK.index[0],
+            CANDLESTICK.index[-1],
+            csv_row.iloc[1]))
+
+    CALIBRATED_CANDLESTICK = calibrate_candlestick(
+        CANDLESTICK, csv_row.iloc[2:])
+
+    # Check calibrate accuracy
+    if CALIBRATED_CANDLESTICK[-1] != None:
+        LOG.append("Error: Fail to calibrate due to high error at {0}% > 0.5% at file {1}. Ref: {2}".format(
+            CALIBRATED_CANDLESTICK[-1][0], img_file, CALIBRATED_CANDLESTICK[-1][1:]))
+
+    # Convert into pd.DataFrame with time column (datetime64, formatted on export)
+    DF_CANDLESTICK = CALIBRATED_CANDLESTICK[0].reset_index()
+
+    LOG.append(f"{len(CANDLESTICK)} candlesticks fetched")
+
+    return img_file, DF_CANDLESTICK, LOG
+
+
 def candlestick_reader(path_input: str,
                        img_input: list,
                        batch_input: tuple,
                        csv_input: str,
-                       excluded_time: list,
+                       excluded_time: np.ndarray,
                        name: str,
-                       path_output: str) -> dict:
+                       path_output: str,
+                       workers: int = 1,
+                       crop_box: tuple = None,
+                       path_bars: str = None) -> dict:
     """Read candlestick chart image and return csv file of price values
 
     Args:
@@ -189,9 +333,12 @@ def candlestick_reader(path_input: str,
         img_input (list): list of input image file names
         batch_input (tuple): tuple of image file slicing
         csv_input (str): path to csv input file path
-        excluded_time (list): list of holidays or other excluded time
+        excluded_time (np.ndarray): holidays or other excluded time (calk.read_excluded_time)
         name (str): prefix of filename ({name}_{initial_date}_{final_date})
         path_output (str): path for output csv files
+        workers (int): number of worker processes (1 = run in this process)
+        crop_box (tuple): plot region (left, upper, right, lower) in pixel, whole image if None
+        path_bars (str): .bars file to append new bars to (stk.BarFile), skipped if None
 
     Returns:
         csv file (.csv): column name: [
@@ -229,43 +376,20 @@ def candlestick_reader(path_input: str,
 
     DFS_CANDLESTICK = {}  # {img_file: pd.DataFrame}
 
-    for count, img_file in enumerate(sorted(img_input), start=batch_input[0]):
-        print(f"Processing Image {img_file}")
-
-        # Load the image and convert into list
-        IMG = Image.open(str(path_input) + str(img_file))
-        IMG_LIST = np.asarray(IMG).tolist()
-
-        CANDLESTICK_POLYMERASE = highlight_candlestick(IMG_LIST)
-        CANDLESTICK = interpret_candlestick(
-            CANDLESTICK_POLYMERASE, CSV.iloc[count, 0], excluded_time)
-        
-        # Check last candlestick
-        if list(CANDLESTICK.keys())[-1] != CSV.iloc[count, 1]:
-            print("Error: Last candlestick date ({0} to {1}) is not corresponded to CSV ({2})".format(
-                list(CANDLESTICK.keys())[0],
-                list(CANDLESTICK.keys())[-1],
-                CSV.iloc[count, 1]))
-
-        CALIBRATED_CANDLESTICK = calibrate_candlestick(
-            CANDLESTICK, CSV.iloc[count, 2:])
-        
-        # Check calibrate accuracy
-        if CALIBRATED_CANDLESTICK[-1] != None:
-            print("Error: Fail to calibrate due to high error at {0}% > 0.5% at file {1}. Ref: {2}".format(
-                CALIBRATED_CANDLESTICK[-1][0], img_file, CALIBRATED_CANDLESTICK[-1][1:]))
-
-        # Convert into pd.DataFrame
-        DF_CANDLESTICK = pd.DataFrame(CALIBRATED_CANDLESTICK[0]).transpose(
-        ).reset_index().rename(columns={'index': 'time'})
-
-        # Convert dt.datetime to string
-        DF_CANDLESTICK.time = DF_CANDLESTICK.time.dt.strftime(
-            '%d-%b-%Y, %H:%M:%S')
-
-        # Store in dictionary
+    # Pair each image with its CSV row before dispatching
+    JOBS = [(path_input, img_file, CSV.iloc[count, :], excluded_time, crop_box)
+            for count, img_file in enumerate(sorted(img_input), start=batch_input[0])]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            RESULTS = list(executor.map(read_candlestick_image, *zip(*JOBS)))
+    else:
+        RESULTS = [read_candlestick_image(*job) for job in JOBS]
+
+    # Store in dictionary by image order
+    for img_file, DF_CANDLESTICK, LOG in RESULTS:
         DFS_CANDLESTICK[img_file] = DF_CANDLESTICK
-        print(f"{len(CANDLESTICK)} candlesticks fetched")
+        print(*LOG, sep="\n")
         print("..............................")
 
     # Merge all DataFrames
@@ -279,9 +403,19 @@ def candlestick_reader(path_input: str,
 
     # Export csv file
     NAME_DATE = CSV.iloc[batch_input[0], 0].strftime("%y%m%d") + '_' + CSV.iloc[batch_input[1] - 1, 1].strftime("%y%m%d")
-    DF_MERGE_CANDLESTICK.to_csv((path_output + name + '_' + NAME_DATE + '.csv'),
+    PATH_CSV = Path(path_output + name + '_' + NAME_DATE + '.csv')
+    DF_MERGE_CANDLESTICK.to_csv(PATH_CSV,
                                 sep=',',
-                                encoding='utf-8')
+                                encoding='utf-8',
+                                date_format=stk.BAR_TIME_FORMAT)
+
+    # Export typed store next to csv (written after csv so loaders treat it as fresh)
+    stk.write_store(DF_MERGE_CANDLESTICK[stk.BAR_COLUMNS], PATH_CSV.with_suffix(stk.STORE_SUFFIX))
+
+    # Append bars newer than the last stored one to shared bar file
+    if path_bars is not None:
+        APPENDED = stk.BarFile(path_bars).append(DF_MERGE_CANDLESTICK[stk.BAR_COLUMNS])
+        print(f"{APPENDED} new candlesticks are appended to {path_bars}")
 
     print(f"{len(DF_MERGE_CANDLESTICK)} candlesticks are successfully exported")
     print("----------COMPLETED-----------")
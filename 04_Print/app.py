@@ -1,52 +1,432 @@
 """Python app for generating HTML pages"""
 
-import glob
+import os
+import sys
+import gzip
+import hashlib
+import mimetypes
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 import datetime as dt
+import click
+import numpy as np
 import pandas as pd
-from flask import Flask, render_template
+from flask import Flask, abort, render_template, request, send_file, url_for
+from werkzeug.security import safe_join
 
-# Configure application
-app = Flask(__name__)
+# Import shared toolkit
+sys.path.append(str(Path(__file__).resolve().parents[1] / "00_Pinksheepkit"))
+from marketkit import storekit as stk
+
+# Brotli is optional, gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Configure application (static files are served by static_file below)
+app = Flask(__name__, static_folder=None)
 
 # Ensure templates are auto-reloaded
 app.config["TEMPLATES_AUTO_RELOAD"] = True
 
-# Define dict storing data of each page
-page_dict = {}
-candle_path = "/workspaces/Enterprise/04_Print/static/data/candle*.png"
-forex_path = "/workspaces/Enterprise/04_Print/static/data/forex_html.csv"
-df_parsed_forex = pd.read_csv(forex_path).drop(columns=['Unnamed: 0'])
+# Data of each page: candle_YY_WW.png and forex_YY_WW.html (see chart_generator)
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+DATA_DIR = STATIC_DIR / "data"
 
-for page, path in enumerate(sorted(glob.glob(candle_path, recursive=True))):
-    try:
-        # get file name and store file data in dict
-        file_name = Path(path).stem
+# Data of API: memory-mapped .bars file if built by candlestick_reader, csv otherwise
+UNIVERSAL_DIR = Path(__file__).resolve().parents[1] / "00_Pinksheepkit" / "universal_data"
+PATH_BARS = UNIVERSAL_DIR / "XAUUSD-1H.bars"
+PATH_BARS_CSV = UNIVERSAL_DIR / "XAUUSD-1H_220103_230503.csv"
+PATH_EVENTS = UNIVERSAL_DIR / "FOREX_220103_230513.csv"
+
+# Naive times of bars and events are 24H UTC+7 (see scrapper handle_time)
+DATA_TIMEZONE = dt.timezone(dt.timedelta(hours=7))
+
+# Rows serialized per streamed chunk of API responses
+CHUNK_SIZE = 1000
+
+# Number of pages per response on "/" (size=0 -> all pages, i.e. for printing)
+PAGE_SIZE = 10
+
+# Number of rendered page fragments kept in memory
+CACHE_SIZE = 32
+
+# Cache policies: versioned assets never change, everything else revalidates by ETag
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Content encodings in order of preference -> file suffix of precompressed variant
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+COMPRESSIBLE = (".css", ".html", ".js", ".svg", ".csv", ".txt")
+
+
+class PageStore:
+    """Lazy store of weekly pages
+
+    Page metadata comes from candle file names only and is rebuilt when the
+    data folder changes. The forex table fragment of a week is read only when
+    its page is rendered. Rendered pages are kept in an LRU keyed by page and
+    invalidated when the mtime of the chart or the forex fragment changes.
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR, cache_size: int = CACHE_SIZE) -> None:
+        self.data_dir = Path(data_dir)
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self._pages = (None, [])  # (folder mtime, list of page dict)
+        self._fragments = OrderedDict()  # {page: (key, html)}
+
+    @staticmethod
+    def _mtime(path: Path) -> int:
+        try:
+            return path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def pages(self) -> list:
+        """Metadata of every page sorted by year and week"""
+        mtime = self._mtime(self.data_dir)
+        with self.lock:
+            if self._pages[0] != mtime:
+                names = sorted(entry.name for entry in os.scandir(self.data_dir)
+                               if entry.name.startswith("candle") and entry.name.endswith(".png"))
+                self._pages = (mtime, [self._page_info(name) for name in names])
+            return self._pages[1]
+
+    @staticmethod
+    def _page_info(name: str) -> dict:
+        # get date range from file name i.e. candle_22_01.png
+        file_name = Path(name).stem
         year, week = file_name.split('_')[1], file_name.split('_')[2]
         temp_date = dt.datetime.strptime(year + '-' + week + '-1', "%y-%U-%w")
-        start_date = temp_date.strftime('%d %b %y')
-        end_date = (temp_date + dt.timedelta(days=6)).strftime('%d %b %y')
-        page_dict[page] = {'candle': file_name + '.png',
-                           'year': year,
-                           'week': week,
-                           'start_date': start_date,
-                           'end_date': end_date,
-                           'forex': df_parsed_forex.iloc[page, -1]}
-
-    # error case
-    except FileNotFoundError as e:
-        print(e)
+        return {'candle': name,
+                'forex_file': f"forex_{year}_{week}.html",
+                'year': year,
+                'week': week,
+                'start_date': temp_date.strftime('%d %b %y'),
+                'end_date': (temp_date + dt.timedelta(days=6)).strftime('%d %b %y')}
+
+    def find(self, year: str, week: str) -> int:
+        """Page number of given year and week, None if not found"""
+        for page, info in enumerate(self.pages()):
+            if (info['year'], info['week']) == (year, week):
+                return page
+        return None
+
+    def forex(self, page: int) -> str:
+        """HTML table of forex events of page, empty if its fragment does not exist"""
+        try:
+            return (self.data_dir / self.pages()[page]['forex_file']).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return ""
+
+    def fragment(self, page: int) -> str:
+        """Rendered page.html of page, served from cache while its files are unchanged"""
+        info = self.pages()[page]
+        key = (info['candle'], self._mtime(self.data_dir / info['candle']),
+               self._mtime(self.data_dir / info['forex_file']))
+
+        with self.lock:
+            cached = self._fragments.get(page)
+            if cached is not None and cached[0] == key:
+                self._fragments.move_to_end(page)
+                return cached[1]
+
+        html = render_template("page.html", page=page, content=dict(info, forex=self.forex(page)))
+
+        with self.lock:
+            self._fragments[page] = (key, html)
+            self._fragments.move_to_end(page)
+            while len(self._fragments) > self.cache_size:
+                self._fragments.popitem(last=False)
+        return html
+
+
+page_store = PageStore()
+
+
+class DataStore:
+    """Indexed in-memory store of bars and events for the data API
+
+    Both tables are loaded through storekit on first use, kept sorted by time
+    and reloaded when their file mtime changes. Time ranges are found with
+    binary search.
+    """
+
+    def __init__(self, path_bars: Path = None, path_events: Path = PATH_EVENTS) -> None:
+        self.path_bars = path_bars
+        self.path_events = Path(path_events)
+        self.lock = threading.Lock()
+        self._bars = (None, None)  # (file mtime, pd.DataFrame)
+        self._events = (None, None)  # (file mtime, pd.DataFrame)
+
+    def _bars_path(self) -> Path:
+        if self.path_bars is not None:
+            return Path(self.path_bars)
+        return PATH_BARS if PATH_BARS.exists() else PATH_BARS_CSV
+
+    def bars(self, start: pd.Timestamp = None, end: pd.Timestamp = None) -> pd.DataFrame:
+        """Bars in [start, end)"""
+        path = self._bars_path()
+        mtime = path.stat().st_mtime_ns
+        with self.lock:
+            if self._bars[0] != (path, mtime):
+                df_bars = stk.load_bars(path).sort_values(by=['time'], kind='stable')
+                self._bars = ((path, mtime), df_bars.reset_index(drop=True))
+            df_bars = self._bars[1]
+        return df_bars.iloc[slice(*self._range(df_bars['time'], start, end))]
+
+    def events(self, start: pd.Timestamp = None, end: pd.Timestamp = None,
+               currency: list = None, impact: list = None) -> pd.DataFrame:
+        """Events in [start, end) of given currencies and impacts (None = all)"""
+        mtime = self.path_events.stat().st_mtime_ns
+        with self.lock:
+            if self._events[0] != mtime:
+                df_events = stk.load_events(self.path_events)
+                df_events = df_events.loc[df_events['datetime'].notna()].sort_values(
+                    by=['datetime'], kind='stable').reset_index(drop=True)
+                self._events = (mtime, df_events[['datetime', 'currency', 'impact', 'event',
+                                                  'actual', 'forecast', 'previous']])
+            df_events = self._events[1]
+
+        df_events = df_events.iloc[slice(*self._range(df_events['datetime'], start, end))]
+        if currency:
+            df_events = df_events.loc[df_events['currency'].isin(currency)]
+        if impact:
+            df_events = df_events.loc[df_events['impact'].isin(impact)]
+        return df_events
+
+    @staticmethod
+    def _range(times: pd.Series, start: pd.Timestamp, end: pd.Timestamp) -> tuple:
+        first = 0 if start is None else times.searchsorted(start, side='left')
+        stop = len(times) if end is None else times.searchsorted(end, side='left')
+        return first, max(first, stop)
+
+
+data_store = DataStore()
+
+
+def downsample_bars(df_bars: pd.DataFrame, buckets: int) -> pd.DataFrame:
+    """Merge consecutive bars into at most buckets OHLC bars
+
+    Each bucket keeps first time and open, max high, min low and last close,
+    so a chart drawn from it has the same extremes as the full range.
+    Bars are returned with the same columns (count = 1) when not merged.
+    """
+    if buckets <= 0 or len(df_bars) <= buckets:
+        return df_bars.assign(count=np.ones(len(df_bars), dtype=np.int64))
+
+    first = np.unique(np.linspace(0, len(df_bars), buckets, endpoint=False).astype(np.int64))
+    last = np.r_[first[1:], len(df_bars)] - 1
+
+    df_buckets = pd.DataFrame({
+        'time': df_bars['time'].to_numpy()[first],
+        'open': df_bars['open'].to_numpy()[first],
+        'high': np.maximum.reduceat(df_bars['high'].to_numpy(), first),
+        'low': np.minimum.reduceat(df_bars['low'].to_numpy(), first),
+        'close': df_bars['close'].to_numpy()[last]})
+    df_buckets['%Change'] = np.round(
+        100 * (df_buckets['close'] - df_buckets['open']) / df_buckets['open'], 4)
+    df_buckets['count'] = last - first + 1
+
+    return df_buckets
+
+
+def stream_records(df: pd.DataFrame, form: str):
+    """Yield DataFrame as JSON array or NDJSON in chunks of CHUNK_SIZE rows"""
+    if form == "json":
+        yield "["
+    for chunk_start in range(0, len(df), CHUNK_SIZE):
+        lines = df.iloc[chunk_start:chunk_start + CHUNK_SIZE].to_json(
+            orient='records', lines=True, date_format='iso', date_unit='s').rstrip("\n")
+        if form == "json":
+            yield ("," if chunk_start > 0 else "") + lines.replace("\n", ",")
+        else:
+            yield lines + "\n"
+    if form == "json":
+        yield "]"
+
+
+def api_datetime(name: str) -> pd.Timestamp:
+    """Parse datetime query argument as naive data time, None if absent, abort 400 if invalid
+
+    Offset-aware values (i.e. 2022-06-06T05:00Z) are converted to DATA_TIMEZONE.
+    """
+    if name not in request.args:
+        return None
+    try:
+        value = pd.Timestamp(request.args[name])
+    except (ValueError, TypeError):
+        value = pd.NaT
+    if value is pd.NaT:
+        abort(400, description=f"{name} must be ISO datetime i.e. 2022-06-06T05:00")
+
+    if value.tzinfo is not None:
+        value = value.tz_convert(DATA_TIMEZONE).tz_localize(None)
+    return value
+
+
+def api_arguments() -> tuple:
+    """Parse start, end and format query arguments, abort 400 if invalid"""
+    start = api_datetime("start")
+    end = api_datetime("end")
+
+    form = request.args.get("format", "json")
+    if form not in ("json", "ndjson"):
+        abort(400, description="format must be json or ndjson")
+    return start, end, form
+
+
+def api_response(df: pd.DataFrame, form: str):
+    """Streamed JSON or NDJSON response of DataFrame"""
+    mimetype = "application/json" if form == "json" else "application/x-ndjson"
+    return app.response_class(stream_records(df, form), mimetype=mimetype)
+
+
+@lru_cache(maxsize=1024)
+def _file_hash(path: str, mtime: int) -> str:
+    with open(path, "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()[:16]
+
+def content_hash(path: Path) -> str:
+    """Hash of file content, recomputed only when its mtime changes"""
+    return _file_hash(str(path), path.stat().st_mtime_ns)
+
+@app.template_global()
+def asset_url(filename: str) -> str:
+    """URL of static file versioned by its content hash -> cached as immutable"""
+    return url_for("static", filename=filename, v=content_hash(STATIC_DIR / filename))
+
+def accepted_encoding() -> str:
+    """Preferred content encoding accepted by client, None if identity only"""
+    for encoding in ENCODINGS:
+        if encoding == "br" and brotli is None:
+            continue
+        if request.accept_encodings[encoding]:
+            return encoding
+    return None
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress body once per content version"""
+    if encoding == "br":
+        return brotli.compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+# Static files: content-hash ETag, immutable when versioned, precompressed variants
+@app.route("/static/<path:filename>", methods=["GET"], endpoint="static")
+def static_file(filename):
+    path = safe_join(str(STATIC_DIR), filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    path = Path(path)
+    etag = content_hash(path)
+
+    # Serve precompressed variant if accepted and not older than source
+    serve_path, encoding = path, None
+    if path.suffix in COMPRESSIBLE:
+        for name, suffix in ENCODINGS.items():
+            variant = path.with_name(path.name + suffix)
+            if (request.accept_encodings[name] and variant.exists()
+                    and variant.stat().st_mtime_ns >= path.stat().st_mtime_ns):
+                serve_path, encoding = variant, name
+                break
+
+    response = send_file(serve_path, mimetype=mimetypes.guess_type(path.name)[0],
+                         conditional=False, etag=False)
+    if path.suffix in COMPRESSIBLE:
+        response.vary.add("Accept-Encoding")
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+        etag = f"{etag}-{encoding}"
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = IMMUTABLE if request.args.get("v") == content_hash(path) else REVALIDATE
+    return response.make_conditional(request)
+
 
 @app.after_request
 def after_request(response):
-    """Ensure responses aren't cached"""
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-    response.headers["Expires"] = 0
-    response.headers["Pragma"] = "no-cache"
-    return response
+    """ETag, conditional GET and compression of rendered HTML pages"""
+    if (request.endpoint == "static" or response.status_code != 200
+            or response.mimetype != "text/html" or response.direct_passthrough):
+        return response
+
+    response.headers["Cache-Control"] = REVALIDATE
+    response.add_etag()
+
+    encoding = accepted_encoding()
+    if encoding is not None:
+        etag = response.get_etag()[0]
+        response.set_data(compress(response.get_data(), encoding))
+        response.headers["Content-Encoding"] = encoding
+        response.set_etag(f"{etag}-{encoding}")
+    response.vary.add("Accept-Encoding")
+
+    return response.make_conditional(request)
+
+
+# Build step: flask --app app precompress
+@app.cli.command("precompress")
+def precompress():
+    """Write .gz (and .br with brotli) variants of compressible static files"""
+    for path in sorted(STATIC_DIR.rglob("*")):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE:
+            continue
+        data = path.read_bytes()
+        for encoding, suffix in ENCODINGS.items():
+            if encoding == "br" and brotli is None:
+                continue
+            compressed = compress(data, encoding)
+            path.with_name(path.name + suffix).write_bytes(compressed)
+            click.echo(f"{path.relative_to(STATIC_DIR)}{suffix}: {len(data)} -> {len(compressed)} bytes")
 
 # Index (main) page
 @app.route("/", methods=["GET"])
 def index():
+    # Slice of pages to display (?page=1&size=10, size=0 -> all)
+    page_count = len(page_store.pages())
+    size = max(request.args.get("size", PAGE_SIZE, type=int), 0) or max(page_count, 1)
+    number = max(request.args.get("page", 1, type=int), 1)
+    if (number - 1) * size >= max(page_count, 1):
+        abort(404)  # Past last page (page 1 always exists for the cover)
+    pages = range((number - 1) * size, min(number * size, page_count))
+
     # Display data on index.html
-    return render_template("index.html", content_pages=list(page_dict.items()))
+    return render_template("index.html",
+                           cover=(number == 1),
+                           fragments=[page_store.fragment(page) for page in pages],
+                           prev_page=(number - 1) if number > 1 else None,
+                           next_page=(number + 1) if number * size < page_count else None,
+                           size=size)
+
+# Single week page
+@app.route("/week/<year>/<week>", methods=["GET"])
+def week_page(year, week):
+    page = page_store.find(year, week)
+    if page is None:
+        abort(404)
+
+    return render_template("index.html", cover=False, fragments=[page_store.fragment(page)],
+                           prev_page=None, next_page=None, size=1)
+
+# Bars API: /api/bars?start=2022-06-06&end=2022-06-13&buckets=500&format=ndjson
+@app.route("/api/bars", methods=["GET"])
+def api_bars():
+    start, end, form = api_arguments()
+    buckets = request.args.get("buckets", 0, type=int)
+
+    return api_response(downsample_bars(data_store.bars(start, end), buckets), form)
+
+# Events API: /api/events?start=2022-06-06&currency=USD,EUR&impact=High,Medium
+@app.route("/api/events", methods=["GET"])
+def api_events():
+    start, end, form = api_arguments()
+    currency = [value for value in request.args.get("currency", "").split(",") if value]
+    impact = [value for value in request.args.get("impact", "").split(",") if value]
+
+    return api_response(data_store.events(start, end, currency, impact), form)
@@ -7,31 +7,41 @@
 
     Out:
     1. .png image of candlestick chart
-    2. .csv file of FOREX economic data parsed by week
+    2. .html table fragment of FOREX economic data parsed by week
 
     This is a cat -> 🐈
 """
 
 # Imports
-import datetime as dt
+import sys
+import os
+import json
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import matplotlib.dates as mdates
+import jinja2
 from tqdm import tqdm
 
-# Configure fonts
-FONT_PATH = "/workspaces/Enterprise/00_Pinksheepkit/fonts/poppins/Poppins-{0}.ttf"
+# Import shared toolkit
+sys.path.append(str(Path(__file__).resolve().parents[2] / "00_Pinksheepkit"))
+from marketkit import calendarkit as calk
+from marketkit import candlekit as candk
+from marketkit import storekit as stk
+from matplotkit import matplotkit as mtk
+
+# Configure fonts (resolved and cached by matplotkit on first chart)
 HEADING = "Bold"
 LABEL = "Medium"
 CONTENT = "Regular"
 
-# Font properties **kwargs -> usage: plt.some_method(**H_FONT)
-H_FONT = {"fontproperties": fm.FontProperties(fname=FONT_PATH.format(HEADING)), "size": 12}
-L_FONT = {"fontproperties": fm.FontProperties(fname=FONT_PATH.format(LABEL)), "size": 10}
-C_FONT = {"fontproperties": fm.FontProperties(fname=FONT_PATH.format(CONTENT)), "size": 8}
+# Font sizes -> usage: plt.some_method(**mtk.font(HEADING, H_SIZE))
+H_SIZE = 12
+L_SIZE = 10
+C_SIZE = 8
 
 # color palattes for candlestick chart
 C_BULL = "#51A299"
@@ -42,39 +52,104 @@ C_LOW = "#A3E635"
 C_MEDIUM = "#FACC15"
 C_HIGH = "#F87171"
 
-# Configure pandas and matplotlib settings
+# Configure pandas settings (matplotlib style is applied by ChartRenderer per figure)
 pd.options.mode.chained_assignment = None  # default='warn'
-mpl.rcParams['grid.color'] = '#f0f0f0'
-plt.rcParams['figure.dpi'] = 300
 
 # Root path
 ROOT = '/workspaces/Enterprise/04_Print/static/data/'
 
+# Render manifest: chart file name -> digest of the data it was rendered from
+MANIFEST = 'candle_manifest.json'
+FOREX_MANIFEST = 'forex_manifest.json'
+
+# Bump when chart style changes so every week is rendered again
+RENDER_VERSION = 1
+FOREX_TEMPLATE_VERSION = 2
+
+# Forex table template (shared templates folder of print app), compiled once
+FOREX_ENVIRONMENT = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(Path(__file__).resolve().parents[1] / "templates"),
+    autoescape=True, keep_trailing_newline=True)
+FOREX_COLUMNS = ["date", "time", "impact", "event", "actual", "forecast", "previous", "%change"]
+IMPACT_COLOR = {'Low': C_LOW, 'Medium': C_MEDIUM, 'High': C_HIGH}
+BAR_DURATION = pd.Timedelta(hours=1)  # XAUUSD-1H bars, datetime is the bar open time
+
+# Function for attaching xauusd %change to each economic news
+def join_change(df_forex: pd.DataFrame, df_xauusd: pd.DataFrame,
+                horizons: tuple = (), tolerance: pd.Timedelta = pd.Timedelta(0)) -> pd.DataFrame:
+    """ As-of join xauusd bars onto economic news by news hour (h_datetime)
+
+    Arg:
+    1. df_forex DataFrame with h_datetime column
+    2. df_xauusd DataFrame
+    3. horizons: extra returns over n hours from the news hour, i.e. (4, 24) -> %change_4h, %change_24h
+    4. tolerance: max distance back to the matched bar (0 = exact hour only)
+
+    Out:
+    1. df_forex DataFrame with %change (and %change_{n}h) columns
+
+    %change_{n}h runs from the price at the news hour to the price n hours later,
+    both read as of their time: the open of the news bar (or the close of the
+    matched bar before it) and the close of the last bar ending by h_datetime + n
+    hours within tolerance, so gaps in the bars never stretch a horizon.
+    """
+
+    # Sort bars by datetime once, a bar covers [datetime, datetime + BAR_DURATION)
+    df_bars = df_xauusd.drop_duplicates(subset=['datetime'], keep='first').sort_values(
+        by=['datetime']).reset_index(drop=True)
+    df_bars['end'] = df_bars['datetime'] + BAR_DURATION
+    df_news = df_forex[['h_datetime']].reset_index().sort_values(by=['h_datetime'])
+
+    # Match each news hour to the last bar at or before it within tolerance
+    df_joined = pd.merge_asof(
+        df_news, df_bars[['datetime', '%Change', 'open', 'close']],
+        left_on='h_datetime', right_on='datetime', direction='backward',
+        tolerance=tolerance).set_index('index').reindex(df_forex.index)
+
+    df_forex['%change'] = df_joined['%Change']
+
+    # Price at news hour: open of news bar, or close of an earlier matched bar
+    start_price = df_joined['open'].where(df_joined['datetime'] == df_joined['h_datetime'],
+                                          df_joined['close']).to_numpy()
+
+    # Price n hours later: close of the last bar ending by then, within tolerance
+    for horizon in horizons:
+        df_news['target'] = df_news['h_datetime'] + pd.Timedelta(hours=horizon)
+        df_end = pd.merge_asof(
+            df_news.sort_values(by=['target']), df_bars[['end', 'close']],
+            left_on='target', right_on='end', direction='backward',
+            tolerance=tolerance).set_index('index').reindex(df_forex.index)
+        end_price = df_end['close'].where(df_end['target'] <= df_bars['end'].max()).to_numpy()
+        df_forex[f'%change_{horizon}h'] = np.round(100 * (end_price - start_price) / start_price, 4)
+
+    return df_forex
+
+
 # Function for data preparation and cleaning to DataFrame
-def prepare_data(path_xauusd: str, path_forex: str) -> tuple:
+def prepare_data(path_xauusd: str, path_forex: str,
+                 horizons: tuple = (), tolerance: pd.Timedelta = pd.Timedelta(0),
+                 start: object = None, end: object = None) -> tuple:
     """ Prepare and clean DataFrame 
 
     Arg:
-    1. XAUUSD.csv path
+    1. XAUUSD .csv, store or .bars path (.bars reads only the [start, end) range)
     2. FOREX.csv path
+    3. horizons: extra %change horizons in hours (see join_change)
+    4. tolerance: max distance back to the matched bar (see join_change)
+    5. start: first datetime to keep (None = whole history)
+    6. end: stop datetime, exclusive (None = whole history)
 
     Out:
     1. pd.DataFrame of XAUUSD
     2. pd.DataFrame of FOREX
     """
 
-    # Read csv
-    df_xauusd = pd.read_csv(path_xauusd, parse_dates=['time']).drop(columns=['Unnamed: 0'])
-    df_forex = pd.read_csv(path_forex, parse_dates=[['date', 'time']],
-                           keep_date_col=True).drop(columns=['Unnamed: 0'])
+    # Load typed bars and events (datetime parsed once and kept in store)
+    df_xauusd = stk.load_bars(path_xauusd, start=start, end=end)
+    df_forex = stk.load_events(path_forex)
 
     # Rename columns
     df_xauusd.rename(columns={'time': 'datetime'}, inplace=True)
-    df_forex.rename(columns={'date_time': 'datetime'}, inplace=True)
-
-    # Change dataype of df_xauusd
-    for col in df_xauusd.columns[1:]:
-        df_xauusd[col] = df_xauusd[col].astype('float64')
 
     # Filter in df_forex
     df_forex = df_forex.loc[df_forex['currency'] == 'USD', :] # Only USD
@@ -82,221 +157,473 @@ def prepare_data(path_xauusd: str, path_forex: str) -> tuple:
     df_forex = df_forex.loc[df_forex.date.notna(), :] # Valid date
 
     # Change dataype of df_forex
-    ## Configure datetime from datetime-like string
-    df_forex['datetime'] = pd.to_datetime(df_forex['datetime'].str.rstrip(' '),
-                                          format='%Y-%m-%d %H:%M', errors="coerce").fillna(
-        pd.to_datetime(df_forex['datetime'].str.rstrip(' '),
-                       format='%Y-%m-%d', errors="coerce"))
     df_forex['date'] = df_forex['datetime'].dt.strftime('%d %b')
     df_forex['time'] = df_forex['time'].fillna('All Day')
-    df_forex['currency'] = df_forex['currency'].astype('category')
-    df_forex['impact'] = df_forex['impact'].astype('category')
+    df_forex['currency'] = df_forex['currency'].cat.remove_unused_categories()
+    df_forex['impact'] = df_forex['impact'].cat.remove_unused_categories()
     df_forex['event'] = df_forex['event'].astype('category')
 
     # Reilter df_forex after type configueation
     df_forex = df_forex.loc[df_forex.datetime.notna(), :] # Valid date
 
-    # Sort values by datetime and reset index
-    df_forex = df_forex.sort_values(by=['datetime']).reset_index(drop=True)
+    # Sort values by datetime, keep [start, end) and reset index
+    df_forex = df_forex.sort_values(by=['datetime'])
+    if start is not None:
+        df_forex = df_forex.loc[df_forex.datetime >= pd.Timestamp(start), :]
+    if end is not None:
+        df_forex = df_forex.loc[df_forex.datetime < pd.Timestamp(end), :]
+    df_forex = df_forex.reset_index(drop=True)
 
     ## Create new nearest-hour-rounded datetime column in df_forex
     ## It will be used to connect df_xauusd datetime column
-    df_forex['h_datetime'] = df_forex.datetime.apply(lambda time: time.replace(
-        second=0, microsecond=0, minute=0, hour=time.hour) + dt.timedelta(hours=time.minute//30))
+    df_forex['h_datetime'] = df_forex.datetime.dt.floor('h') + pd.to_timedelta(
+        df_forex.datetime.dt.minute // 30, unit='h')
 
     # Create new %change column: display %change of xauusd in each economic news hour
-    df_forex['%change'] = df_forex['h_datetime'].apply(
-        lambda time: df_xauusd.loc[df_xauusd.datetime == time, '%Change'].to_list()[0]
-        if df_xauusd[df_xauusd.datetime == time].shape[0] > 0
-        else np.nan)
+    df_forex = join_change(df_forex, df_xauusd, horizons=horizons, tolerance=tolerance)
 
     # Swap column order
     df_forex = df_forex.reindex(columns=[
-        "datetime", "date", "time", "impact", "event", "actual", "forecast", "previous", "%change"])
+        "datetime", "date", "time", "impact", "event", "actual", "forecast", "previous", "%change",
+        *[f"%change_{horizon}h" for horizon in horizons], *stk.EVENT_NUMBER_COLUMNS])
 
     return df_xauusd, df_forex
 
 
+# Function for iterating DataFrame views period by period
+def iter_periods(df_xauusd: pd.DataFrame, df_forex: pd.DataFrame, period: str = 'week'):
+    """ Lazily split xauusd and forex data into periods
+
+    Week key of each row is found once with binary search on the sorted
+    datetime columns, then each period is a positional slice.
+
+    Arg:
+    1. df_xauusd DataFrame
+    2. df_forex DataFrame
+    3. period: 'day', 'week' or 'month'
+
+    Out:
+    1. generator of (period start, df_xauusd slice, df_forex slice)
+    """
+
+    # Binary search needs rows ordered by datetime
+    if not df_xauusd.datetime.is_monotonic_increasing:
+        df_xauusd = df_xauusd.sort_values(by=['datetime'], kind='stable')
+    if not df_forex.datetime.is_monotonic_increasing:
+        df_forex = df_forex.sort_values(by=['datetime'], kind='stable')
+
+    # Get period bounds from first and last days in xauusd DataFrame
+    starts, ends = calk.period_bounds(df_xauusd.datetime.iloc[0], df_xauusd.datetime.iloc[-1], period)
+
+    xauusd_first, xauusd_stop = calk.partition(df_xauusd.datetime, starts, ends)
+    forex_first, forex_stop = calk.partition(df_forex.datetime, starts, ends)
+
+    for i, start in enumerate(starts):
+        yield (pd.Timestamp(start),
+               df_xauusd.iloc[xauusd_first[i]:xauusd_stop[i]],
+               df_forex.iloc[forex_first[i]:forex_stop[i]])
+
+
 # Function for parsing DataFrame weekly
-def parse_data(df_xauusd: pd.DataFrame, df_forex: pd.DataFrame) -> list:
+def parse_data(df_xauusd: pd.DataFrame, df_forex: pd.DataFrame, period: str = 'week') -> list:
     """ Parse xauusd and forex data weekly
 
     Arg:
     1. df_xauusd DataFrame
     2. df_forex DataFrame
+    3. period: 'day', 'week' or 'month'
 
     Out:
     1. list of weekly parsed df_xauusd DataFrame
     2. list of weekly parsed df_forex DataFrame
     """
 
-    # Get first day in xauusd DataFrame
-    origin_date = df_xauusd.iloc[0, 0]
-    terminal_date = df_xauusd.iloc[-1, 0]
-
-    # Get first and last days of the first week
-    week_start = origin_date - dt.timedelta(days=origin_date.weekday()) # time 05:00:00
-    week_end = week_start + dt.timedelta(days=6) # time 05:00:00
-
-    # Parse weekly
-    week_delta = dt.timedelta(weeks=1)
-
     # List of weekly parsed data
     parse_xauusd_list = []
     parse_forex_list = []
 
-    # Loop parsing weekly
-    while week_start < terminal_date:
-        # Append parsed DataFrame
-        parse_xauusd_list.append(
-            df_xauusd[(df_xauusd.datetime >= week_start) & (df_xauusd.datetime < week_end)]
-        )
-        parse_forex_list.append(
-            df_forex[(df_forex.datetime >= week_start) & (df_forex.datetime < week_end)]
-        )
-
-        # Increment week day interval
-        week_start += week_delta
-        week_end += week_delta
+    for _, parse_xauusd, parse_forex in iter_periods(df_xauusd, df_forex, period):
+        parse_xauusd_list.append(parse_xauusd)
+        parse_forex_list.append(parse_forex)
 
     return parse_xauusd_list, parse_forex_list
 
 
+# Class for rendering candlestick charts on one reusable styled figure
+class ChartRenderer:
+    """ Candlestick chart template
+
+    Figure, axes, locators, formatters, grids and spines are set up once.
+    Each render only swaps bar/scatter artists and data limits, then saves.
+    """
+
+    # Setting width of candlestick elements
+    WIDTH_CANDLE = .03
+    WIDTH_WICK = .003
+
+    # Mark FOREX news impact
+    IMPACT_POS = {'Low': 3, 'Medium': 2, 'High': 1}
+
+    def __init__(self) -> None:
+        # Figure drawn on its own Agg canvas -> pyplot backend and rcParams of the process are untouched
+        import matplotlib as mpl
+        import matplotlib.dates as mdates
+        from matplotlib.artist import setp
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        self.setp = setp
+        self.style = lambda: mpl.rc_context(mtk.style())
+
+        # create new figure
+        with self.style():
+            self.fig = Figure(figsize=(12, 4))
+            FigureCanvasAgg(self.fig)
+            self.ax = self.fig.subplots(1, 1)
+            self._format_axes(mdates)
+        self.artists = []
+
+    def _format_axes(self, mdates: object) -> None:
+        """ Tick locators, formatters, grids and spines shared by every chart """
+
+        ax = self.ax
+
+        # Format ticks
+        ax.xaxis.set_major_locator(mdates.DayLocator())
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%d %b'))
+
+        ax.xaxis.set_minor_locator(mdates.HourLocator(byhour=(0, 6, 12, 18)))
+        ax.xaxis.set_minor_formatter(mdates.DateFormatter('%H:%M'))
+
+        ax.xaxis.grid(True, which='minor')
+        ax.yaxis.grid(True)
+
+        ax.tick_params(axis="x", which="major", pad=3.2)
+        ax.tick_params(axis='both', which='both',length=0)
+
+        # ax.set_xlabel('Datetime (24H UTC+7)', **mtk.font(LABEL, L_SIZE))
+        # ax.set_ylabel('Price (USD)', **mtk.font(LABEL, L_SIZE))
+
+        # Format spines and grid
+        ax.spines[['left']].set_visible(False)
+        ax.spines[['right']].set_visible(False)
+        ax.spines[['top']].set_visible(False)
+        ax.spines[['bottom']].set_visible(False)
+        ax.set_axisbelow(True)
+        ax.grid(True)
+
+    def clear(self) -> None:
+        """ Remove artists of previous chart and forget its data limits """
+
+        for artist in self.artists:
+            artist.remove()
+        self.artists = []
+        self.ax.ignore_existing_data_limits = True
+        self.ax.autoscale(True)
+
+    def render(self, df_xauusd_data: pd.DataFrame, df_forex_data: pd.DataFrame, f_name: str) -> None:
+        """ Draw one week on the template and save it
+
+        Arg:
+        1. df_xauusd_data DataFrame
+        2. df_forex_data DataFrame
+        3. f_name: output image path
+        """
+
+        with self.style():
+            self._render(df_xauusd_data, df_forex_data, f_name)
+
+    def _render(self, df_xauusd_data: pd.DataFrame, df_forex_data: pd.DataFrame, f_name: str) -> None:
+        self.clear()
+        ax = self.ax
+
+        # create candlestick features
+        ## 1. bullish-bearish color
+        df_xauusd_data['bb'] = candk.candle_color(df_xauusd_data['%Change'], C_BULL, C_BEAR)
+
+        ## 2.candle-wick patterns xauusd
+        df_xauusd_data[['candle', 'w+', 'w-', 'bottom', 'upper']] = candk.candle_geometry(df_xauusd_data)
+
+        # Plotting df_xauusd_data prices of the stock
+        self.artists.append(ax.bar(df_xauusd_data.datetime, df_xauusd_data['candle'], self.WIDTH_CANDLE,
+                                   bottom=df_xauusd_data['bottom'], color=df_xauusd_data['bb']))
+        self.artists.append(ax.bar(df_xauusd_data.datetime, df_xauusd_data['w+'], self.WIDTH_WICK,
+                                   bottom=df_xauusd_data['upper'], color=df_xauusd_data['bb']))
+        self.artists.append(ax.bar(df_xauusd_data.datetime, df_xauusd_data['w-'], self.WIDTH_WICK,
+                                   bottom=df_xauusd_data['bottom'], color=df_xauusd_data['bb']))
+
+        # Mark FOREX news impact
+        self.artists.append(ax.scatter(
+            df_forex_data.datetime, min(df_xauusd_data.low) -
+            (0.03 * (max(df_xauusd_data.high) - min(df_xauusd_data.low)) *
+            df_forex_data.impact.map(self.IMPACT_POS).astype(int)),
+            marker='o', s=20, c=df_forex_data.impact.map(IMPACT_COLOR), alpha=0.5))
+
+        # Tick labels are rebuilt for new limits -> apply fonts every chart
+        c_font = mtk.font(CONTENT, C_SIZE)
+        self.setp(ax.get_xticklabels(), **c_font, color='#444')
+        self.setp(ax.get_xticklabels(minor=True), color='#777', **c_font)
+        self.setp(ax.get_yticklabels(), **c_font, color='#777')
+
+        # Save figure
+        self.fig.savefig(f_name, bbox_inches='tight')
+
+    def close(self) -> None:
+        """ Release figure """
+
+        self.fig.clear()
+        self.artists = []
+
+
+# Renderer shared by every chart of this process (one per pool worker)
+_RENDERER = None
+
+
 # Function for plot candlestick chart
-def candlestick_chart(df_xauusd_data: pd.DataFrame, df_forex_data: pd.DataFrame) -> int:
+def candlestick_chart(df_xauusd_data: pd.DataFrame, df_forex_data: pd.DataFrame,
+                      root: str = ROOT, renderer: ChartRenderer = None) -> int:
     """ Plot candlestick chart
 
     Arg:
     1. df_xauusd_data DataFrame
     2. df_forex_data DataFrame
+    3. root: output directory
+    4. renderer: ChartRenderer template (None = shared renderer of this process)
 
     Out:
     1. .png image of candlestick chart parsed by week
     """
 
-    # create new DataFrame
-    fig, ax = plt.subplots(1, 1, figsize=(12, 4))
-
-    # create candlestick features
-    ## 1. bullish-bearish color
-    df_xauusd_data['bb'] = df_xauusd_data['%Change'].apply(
-        lambda x: C_BULL if x >= 0 else C_BEAR)
-
-    ## 2.candle-wick patterns xauusd
-    df_xauusd_data['candle'] = df_xauusd_data[['open', 'high', 'low', 'close']].apply(
-        lambda x: sorted(x)[2] - sorted(x)[1], axis=1)
-    df_xauusd_data['w+'] = df_xauusd_data[['open', 'high', 'low', 'close']].apply(
-        lambda x: sorted(x)[3] - sorted(x)[2], axis=1)
-    df_xauusd_data['w-'] = df_xauusd_data[['open', 'high', 'low', 'close']].apply(
-        lambda x: sorted(x)[0] - sorted(x)[1], axis=1)
-    df_xauusd_data['bottom'] = df_xauusd_data[['open', 'high', 'low', 'close']].apply(
-        lambda x: sorted(x)[1], axis=1)
-    df_xauusd_data['upper'] = df_xauusd_data[['open', 'high', 'low', 'close']].apply(
-        lambda x: sorted(x)[2], axis=1)
+    global _RENDERER
 
-    # Setting width of candlestick elements
-    width_candle = .03
-    width_wick = .003
-
-    # Plotting df_xauusd_data prices of the stock
-    ax.bar(df_xauusd_data.datetime, df_xauusd_data['candle'], width_candle,
-           bottom=df_xauusd_data['bottom'], color=df_xauusd_data['bb'])
-    ax.bar(df_xauusd_data.datetime, df_xauusd_data['w+'], width_wick,
-           bottom=df_xauusd_data['upper'], color=df_xauusd_data['bb'])
-    ax.bar(df_xauusd_data.datetime, df_xauusd_data['w-'], width_wick,
-           bottom=df_xauusd_data['bottom'], color=df_xauusd_data['bb'])
+    if renderer is None:
+        if _RENDERER is None:
+            _RENDERER = ChartRenderer()
+        renderer = _RENDERER
 
-    # Mark FOREX news impact
-    impact_mapper_color = {'Low': C_LOW, 'Medium': C_MEDIUM, 'High': C_HIGH}
-    impact_mapper_pos = {'Low': 3, 'Medium': 2, 'High': 1}
-    ax.scatter(df_forex_data.datetime, min(df_xauusd_data.low) -
-               (0.03 * (max(df_xauusd_data.high) - min(df_xauusd_data.low)) *
-               df_forex_data.impact.map(impact_mapper_pos).astype(int)),
-               marker='o', s=20, c=df_forex_data.impact.map(impact_mapper_color), alpha=0.5)
-
-    # Format ticks
-    ax.xaxis.set_major_locator(mdates.DayLocator())
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%d %b'))
-
-    ax.xaxis.set_minor_locator(mdates.HourLocator(byhour=(0, 6, 12, 18)))
-    ax.xaxis.set_minor_formatter(mdates.DateFormatter('%H:%M'))
-
-    ax.xaxis.grid(True, which='minor')
-    ax.yaxis.grid(True)
-
-    ax.tick_params(axis="x", which="major", pad=3.2)
-    ax.tick_params(axis='both', which='both',length=0)
-
-    plt.xticks(**C_FONT, color='#444')
-    plt.xticks(minor=True, color='#777', **C_FONT)
-    plt.yticks(**C_FONT,  color='#777')
-
-    # ax.set_xlabel('Datetime (24H UTC+7)', **L_FONT)
-    # ax.set_ylabel('Price (USD)', **L_FONT)
-
-    # Format spines and grid
-    ax.spines[['left']].set_visible(False)
-    ax.spines[['right']].set_visible(False)
-    ax.spines[['top']].set_visible(False)
-    ax.spines[['bottom']].set_visible(False)
-    ax.set_axisbelow(True)
-    ax.grid(True)
-
-    # Save and close figure
-    f_name = f'{ROOT}candle_{df_xauusd_data.iloc[0, 0].strftime("%y_%U")}.png'
-    plt.savefig(f_name, bbox_inches='tight')
-    plt.close()
+    renderer.render(df_xauusd_data, df_forex_data, os.path.join(root, chart_name(df_xauusd_data)))
 
     return 0
 
 
-# Function for exporting csv of forex html data table
-def forex_html_csv(parse_forex_data: list) -> int:
-    """ Convert pd.DataFrame into HTML and save as .csv file
+# Function for naming chart image of a week
+def chart_name(df_xauusd_data: pd.DataFrame) -> str:
+    """ File name of candlestick chart from its first bar, i.e. candle_22_01.png """
+
+    return f'candle_{df_xauusd_data.iloc[0, 0].strftime("%y_%U")}.png'
+
+
+# Function for reading render manifest
+def read_manifest(path_manifest: str) -> dict:
+    """ {file name: digest} of previous runs, empty if manifest does not exist """
+
+    if not os.path.exists(path_manifest):
+        return {}
+    with open(path_manifest, encoding='utf-8') as file:
+        return json.load(file)
+
+
+# Function for writing render manifest
+def write_manifest(path_manifest: str, manifest: dict) -> None:
+    """ Write manifest to temporary file then swap so a crash never leaves half a manifest """
+
+    path_temp = f'{path_manifest}.tmp'
+    with open(path_temp, 'w', encoding='utf-8') as file:
+        json.dump(dict(sorted(manifest.items())), file, indent=1)
+    os.replace(path_temp, path_manifest)
+
+
+# Function for fingerprinting data of a chart
+def chart_digest(df_xauusd_data: pd.DataFrame, df_forex_data: pd.DataFrame) -> str:
+    """ sha1 digest of every value a candlestick chart is drawn from
 
     Arg:
-    1. List of parsed df.forex
+    1. df_xauusd_data DataFrame
+    2. df_forex_data DataFrame
 
     Out:
-    1. .csv file containing HTML of parsed df.forex
+    1. hex digest string
     """
 
-    # List storing html of pd.DataFrame
-    parse_html_forex = []
+    digest = hashlib.sha1(f'render-{RENDER_VERSION}'.encode())
+    digest.update(pd.util.hash_pandas_object(
+        df_xauusd_data[['datetime', 'open', 'high', 'low', 'close', '%Change']],
+        index=False).to_numpy().tobytes())
+    digest.update(pd.util.hash_pandas_object(
+        df_forex_data[['datetime', 'impact']], index=False).to_numpy().tobytes())
 
-    # Loop over list of pd.DataFrame
-    for parse_df in parse_forex_data:
-        # Convert imapct to color code
-        impact_html_mapper = {
-            'Low': f'<div class="square" style="background-color: {C_LOW};"></div>',
-            'Medium': f'<div class="square" style="background-color: {C_MEDIUM};"></div>', 
-            'High': f'<div class="square" style="background-color: {C_HIGH};"></div>'}
+    return digest.hexdigest()
 
-        parse_df.impact = parse_df.impact.map(impact_html_mapper)
 
-        # Fill na
-        parse_df.loc[:, ["actual", "forecast", "previous"]] = parse_df.loc[:,
-            ["actual", "forecast", "previous"]].fillna('')
+# Function for rendering one chart in a worker process
+def _render_job(job: tuple) -> str:
+    """ Render job (name, df_xauusd_data, df_forex_data, root) and return its name """
 
-        # Rename columns
-        parse_df.columns = ["Datetime", "Date", "Time", "Impact", "Event",
-                            "Actual", "Forecast", "Previous", "%Change"]
+    name, df_xauusd_data, df_forex_data, root = job
+    candlestick_chart(df_xauusd_data, df_forex_data, root)
 
-        # Convert to html (Exclude datetime column)
-        html_forex = parse_df.iloc[:, 1:].to_html(index=False, escape=False)
+    return name
 
-        # Adjust HTML
-        # html_forex = html_forex.replace('"', '')
-        html_forex = html_forex.replace("border", "b")
-        html_forex = html_forex.replace("right", "left")
 
-        parse_html_forex.append(html_forex)
+# Function for rendering only charts whose data changed
+def render_charts(parse_xauusd_data: list, parse_forex_data: list, root: str = ROOT,
+                  workers: int = None, force: bool = False) -> list:
+    """ Incrementally render weekly candlestick charts
 
-    # Export .csv file
-    f_name = f'{ROOT}forex_html.csv'
-    pd.Series(parse_html_forex).to_csv(f_name)
+    Each week is hashed and compared with the render manifest in root. Weeks whose
+    digest is unchanged and whose image exists are skipped, the rest are rendered
+    in a process pool. The manifest is updated after every finished chart so an
+    interrupted run resumes where it stopped.
 
-    return 0
+    Arg:
+    1. List of parsed df_xauusd
+    2. List of parsed df_forex
+    3. root: output directory of images and manifest
+    4. workers: number of processes (None = os.cpu_count(), 1 = in this process)
+    5. force: render every week regardless of manifest
+
+    Out:
+    1. list of rendered image file names
+    """
+
+    path_manifest = os.path.join(root, MANIFEST)
+
+    # Read manifest of previous runs
+    manifest = {} if force else read_manifest(path_manifest)
+
+    # Collect dirty weeks
+    jobs = []
+    digests = {}
+    for parse_df_xauusd, parse_df_forex in zip(parse_xauusd_data, parse_forex_data):
+        if parse_df_xauusd.empty:
+            continue
+
+        name = chart_name(parse_df_xauusd)
+        digests[name] = chart_digest(parse_df_xauusd, parse_df_forex)
+
+        if manifest.get(name) != digests[name] or not os.path.exists(os.path.join(root, name)):
+            jobs.append((name, parse_df_xauusd, parse_df_forex, root))
+
+    rendered = []
+    workers = workers or os.cpu_count() or 1
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            for name in tqdm(executor.map(_render_job, jobs), total=len(jobs)):
+                manifest[name] = digests[name]
+                rendered.append(name)
+                write_manifest(path_manifest, manifest)
+    else:
+        for job in tqdm(jobs):
+            name = _render_job(job)
+            manifest[name] = digests[name]
+            rendered.append(name)
+            write_manifest(path_manifest, manifest)
+
+    return rendered
+
+
+# Function for benchmarking chart rendering
+def benchmark_chart(parse_xauusd_data: list, parse_forex_data: list, count: int = 10) -> dict:
+    """ Compare per-chart render time of a new figure per chart and a reused template
+
+    Arg:
+    1. List of parsed df_xauusd
+    2. List of parsed df_forex
+    3. count: number of weeks to render with each method
+
+    Out:
+    1. dict of seconds per chart {'figure': ..., 'template': ...}
+    """
+
+    weeks = [(parse_df_xauusd.copy(), parse_df_forex.copy()) for parse_df_xauusd, parse_df_forex
+             in zip(parse_xauusd_data, parse_forex_data) if not parse_df_xauusd.empty][:count]
+    result = {}
+
+    with tempfile.TemporaryDirectory() as root:
+        # Build, style and close one figure per chart
+        start = time.perf_counter()
+        for parse_df_xauusd, parse_df_forex in weeks:
+            renderer = ChartRenderer()
+            candlestick_chart(parse_df_xauusd, parse_df_forex, root, renderer)
+            renderer.close()
+        result['figure'] = (time.perf_counter() - start) / len(weeks)
+
+        # Reuse one styled figure
+        start = time.perf_counter()
+        renderer = ChartRenderer()
+        for parse_df_xauusd, parse_df_forex in weeks:
+            candlestick_chart(parse_df_xauusd, parse_df_forex, root, renderer)
+        renderer.close()
+        result['template'] = (time.perf_counter() - start) / len(weeks)
+
+    return result
+
+
+# Function for naming forex table fragment of a week
+def forex_name(df_xauusd_data: pd.DataFrame) -> str:
+    """ File name of forex table fragment, same week key as chart, i.e. forex_22_01.html """
+
+    return f'forex_{df_xauusd_data.iloc[0, 0].strftime("%y_%U")}.html'
+
+
+# Function for fingerprinting rows of a forex table
+def forex_digest(df_forex_data: pd.DataFrame) -> str:
+    """ sha1 digest of every displayed forex value and the table template """
+
+    digest = hashlib.sha1(f'forex-{FOREX_TEMPLATE_VERSION}'.encode())
+    digest.update(pd.util.hash_pandas_object(
+        df_forex_data[FOREX_COLUMNS].astype(str), index=False).to_numpy().tobytes())
+
+    return digest.hexdigest()
+
+
+# Function for exporting html fragments of forex data tables
+def forex_html_fragments(parse_xauusd_data: list, parse_forex_data: list, root: str = ROOT,
+                         force: bool = False) -> list:
+    """ Render forex table of each week into its own HTML fragment file
+
+    Rows are rendered by the compiled templates/forex_table.html straight to
+    forex_YY_WW.html. Weeks whose rows are unchanged since the last run (see
+    forex manifest) and whose fragment exists are skipped.
+
+    Arg:
+    1. List of parsed df_xauusd (names fragments like charts)
+    2. List of parsed df_forex
+    3. root: output directory of fragments and manifest
+    4. force: render every week regardless of manifest
+
+    Out:
+    1. list of rendered fragment file names
+    """
+
+    path_manifest = os.path.join(root, FOREX_MANIFEST)
+    manifest = {} if force else read_manifest(path_manifest)
+    template = FOREX_ENVIRONMENT.get_template('forex_table.html')
+
+    rendered = []
+    for parse_df_xauusd, parse_df_forex in zip(parse_xauusd_data, parse_forex_data):
+        if parse_df_xauusd.empty:
+            continue
+
+        name = forex_name(parse_df_xauusd)
+        digest = forex_digest(parse_df_forex)
+        if manifest.get(name) == digest and os.path.exists(os.path.join(root, name)):
+            continue
+
+        # Format %change with 4 decimals like DataFrame.to_html did
+        rows = zip(parse_df_forex['date'], parse_df_forex['time'],
+                   parse_df_forex['impact'].map(IMPACT_COLOR).astype(object),
+                   parse_df_forex['event'], *[parse_df_forex[col].fillna('')
+                                              for col in ("actual", "forecast", "previous")],
+                   parse_df_forex['%change'].map('{:.4f}'.format).replace('nan', 'NaN'))
+
+        template.stream(rows=rows).dump(os.path.join(root, name), encoding='utf-8')
+        manifest[name] = digest
+        rendered.append(name)
+
+    write_manifest(path_manifest, manifest)
+
+    return rendered
 
 
 # Run this module
@@ -304,6 +631,9 @@ if __name__ == '__main__':
     # Settings
     CHART_PROCESS = False
     TABULAR_PROCESS = True
+    BENCHMARK_PROCESS = False
+    FORCE_RENDER = False # Ignore render manifest and render every week
+    WORKERS = os.cpu_count()
 
     print("Initiating...")
     # Path of two datasets
@@ -319,17 +649,21 @@ if __name__ == '__main__':
     if CHART_PROCESS is True:
         # Render candlestick chart
         print("Rendering images...")
-        for parse_df_xauusd, parse_df_forex in tqdm(zip(parse_xauusd, parse_forex),
-                                                    total=len(parse_xauusd)):
-            candlestick_chart(parse_df_xauusd, parse_df_forex)
+        RENDERED = render_charts(parse_xauusd, parse_forex, workers=WORKERS, force=FORCE_RENDER)
+
+        print(f"Successfully render {len(RENDERED)} images...")
 
-        print("Successfully render images...")
+    if BENCHMARK_PROCESS is True:
+        # Compare per-chart render time
+        print("Benchmarking chart rendering...")
+        for METHOD, SECONDS in benchmark_chart(parse_xauusd, parse_forex).items():
+            print(f"{METHOD}: {SECONDS * 1000:.1f} ms per chart")
 
     if TABULAR_PROCESS is True:
         # Parse HTML of FOREX tabular data
-        print("Parsing HTML...")
-        forex_html_csv(parse_forex)
+        print("Rendering HTML...")
+        RENDERED = forex_html_fragments(parse_xauusd, parse_forex, force=FORCE_RENDER)
 
-        print("Successfully parse html to csv")
+        print(f"Successfully render {len(RENDERED)} html fragments")
 
     print("Completed")
@@ -0,0 +1,79 @@
+"""Local stand-in of the Forex Factory calendar
+
+Serves the saved pages of tests/fixtures/forexfactory at /calendar?day=jan3.2022
+on a free localhost port, records every request and can delay or fail days:
+
+    with CalendarServer(fail={"jan4.2022": 1}, delay={"jan3.2022": 0.2}) as server:
+        pages = list(sf.fetch_calendars(dates, base_url=server.base_url))
+"""
+
+# Imports
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures" / "forexfactory"
+
+
+class CalendarHandler(BaseHTTPRequestHandler):
+    """GET /calendar?day=... -> saved page, 503 while the day has failures left, 404 if unknown"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        day = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query).get("day", [""])[0]
+        with server.lock:
+            server.hits.append((day, time.monotonic()))
+            failing = server.fail.get(day, 0) > 0
+            if failing:
+                server.fail[day] -= 1
+
+        time.sleep(server.delay.get(day, 0))
+        path = server.fixture_dir / (day + ".html")
+        if failing:
+            self.send_body(503, b"")
+        elif path.name != ".html" and path.exists():
+            self.send_body(200, path.read_bytes())
+        else:
+            self.send_body(404, b"")
+
+    def send_body(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CalendarServer(ThreadingHTTPServer):
+    """Threaded calendar stand-in, served in a daemon thread while used as context manager"""
+
+    daemon_threads = True
+
+    def __init__(self, fixture_dir: Path = FIXTURE_DIR, fail: dict = None, delay: dict = None) -> None:
+        super().__init__(("127.0.0.1", 0), CalendarHandler)
+        self.fixture_dir = Path(fixture_dir)
+        self.fail = dict(fail or {})  # {day: number of 503 responses before success}
+        self.delay = dict(delay or {})  # {day: seconds before responding}
+        self.hits = []  # [(day, monotonic time of request)]
+        self.lock = threading.Lock()
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}/calendar"
+
+    def __enter__(self) -> "CalendarServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def days(self) -> list:
+        """Requested days in arrival order"""
+        with self.lock:
+            return [day for day, _ in self.hits]
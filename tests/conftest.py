@@ -0,0 +1,32 @@
+"""Shared pytest setup
+
+Stage folders (01_Scrapper, 02_Candlestick, 04_Print, ...) are script folders,
+not packages, so their modules are imported the way the scripts do it: with
+the folder on sys.path.
+"""
+
+# Imports
+import datetime as dt
+import sys
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+CALENDAR_FIXTURES = FIXTURES / "forexfactory"
+
+for folder in ("00_Pinksheepkit", "01_Scrapper", "02_Candlestick", "04_Print/candlestick_chart", "04_Print"):
+    sys.path.insert(0, str(ROOT / folder))
+
+
+def calendar_date(day: str) -> dt.datetime:
+    """Date of a saved calendar page named by its ?day= query i.e. jan3.2022"""
+    return dt.datetime.strptime(day.capitalize(), "%b%d.%Y")
+
+
+@pytest.fixture(scope="session")
+def calendar_pages() -> list:
+    """Saved calendar pages as list of tuple(HTML, dt.datetime) in date order"""
+    pages = [(path.read_text(encoding="utf-8"), calendar_date(path.stem))
+             for path in CALENDAR_FIXTURES.glob("*.html")]
+    return sorted(pages, key=lambda page: page[1])
@@ -0,0 +1,116 @@
+"""Tests of 04_Print/app.py with the Flask test client"""
+
+# Imports
+import json
+import pytest
+import app as print_app
+
+BAR_KEYS = ["time", "open", "high", "low", "close", "%Change", "count"]
+
+
+@pytest.fixture
+def client():
+    return print_app.app.test_client()
+
+
+@pytest.mark.parametrize("query", ["start=", "start=abc", "end=NaT", "format=csv"])
+def test_api_rejects_invalid_arguments(client, query):
+    assert client.get("/api/bars?" + query).status_code == 400
+
+
+def test_api_converts_offset_aware_datetimes(client):
+    # 05:00Z is 12:00 in data time (UTC+7)
+    aware = client.get("/api/bars?start=2022-06-06T05:00Z&end=2022-06-06T08:00Z")
+    naive = client.get("/api/bars?start=2022-06-06T12:00&end=2022-06-06T15:00")
+    assert aware.status_code == naive.status_code == 200
+    assert aware.get_data() == naive.get_data()
+    assert json.loads(aware.get_data())[0]["time"] == "2022-06-06T12:00:00"
+
+    events = client.get("/api/events?start=2022-06-06T00:00%2B07:00&end=2022-06-07T00:00%2B07:00")
+    assert events.status_code == 200
+
+
+@pytest.mark.parametrize("buckets", [0, 5, 1000])
+def test_api_bars_schema_does_not_depend_on_buckets(client, buckets):
+    response = client.get(f"/api/bars?start=2022-06-06&end=2022-06-07&buckets={buckets}")
+    records = json.loads(response.get_data())
+    assert len(records) > 0
+    assert all(list(record) == BAR_KEYS for record in records)
+    assert sum(record["count"] for record in records) == 19
+
+
+def test_api_ndjson_matches_json(client):
+    records = json.loads(client.get("/api/bars?start=2022-06-06&end=2022-06-07").get_data())
+    lines = client.get("/api/bars?start=2022-06-06&end=2022-06-07&format=ndjson").get_data(as_text=True)
+    assert [json.loads(line) for line in lines.splitlines()] == records
+
+
+def revalidate(client, url, **headers):
+    """(first response, conditional response with its ETag)"""
+    first = client.get(url, headers=headers)
+    second = client.get(url, headers=dict(headers, **{"If-None-Match": first.headers["ETag"]}))
+    return first, second
+
+
+def test_html_page_returns_304_when_etag_matches(client):
+    first, second = revalidate(client, "/week/22/01")
+    assert first.status_code == 200 and "Content-Encoding" not in first.headers
+    assert first.headers["Cache-Control"] == print_app.REVALIDATE
+    assert second.status_code == 304 and second.get_data() == b""
+
+
+def test_gzip_html_page_returns_304_and_is_smaller(client):
+    raw = client.get("/week/22/01")
+    first, second = revalidate(client, "/week/22/01", **{"Accept-Encoding": "gzip"})
+    assert first.status_code == 200 and first.headers["Content-Encoding"] == "gzip"
+    assert first.headers["ETag"] != raw.headers["ETag"]
+    assert "Accept-Encoding" in first.headers["Vary"]
+    assert len(first.get_data()) < len(raw.get_data())
+    assert second.status_code == 304
+
+
+def test_chart_png_returns_304_when_etag_matches(client):
+    first, second = revalidate(client, "/static/data/candle_22_01.png")
+    assert first.status_code == 200 and first.mimetype == "image/png"
+    assert first.headers["Cache-Control"] == print_app.REVALIDATE
+    assert second.status_code == 304
+    first.close()
+
+
+def test_versioned_assets_are_immutable(client):
+    with print_app.app.test_request_context():
+        url = print_app.asset_url("styles.css")
+    assert "?v=" in url and url in client.get("/").get_data(as_text=True)
+
+    versioned = client.get(url)
+    assert versioned.headers["Cache-Control"] == print_app.IMMUTABLE
+    stale = client.get("/static/styles.css?v=0")
+    assert stale.headers["Cache-Control"] == print_app.REVALIDATE
+    versioned.close()
+    stale.close()
+
+
+def test_precompressed_static_variant_is_served(client, tmp_path, monkeypatch):
+    (tmp_path / "styles.css").write_bytes((print_app.STATIC_DIR / "styles.css").read_bytes())
+    monkeypatch.setattr(print_app, "STATIC_DIR", tmp_path)
+    result = print_app.app.test_cli_runner().invoke(args=["precompress"])
+    assert result.exit_code == 0 and (tmp_path / "styles.css.gz").exists()
+
+    raw = client.get("/static/styles.css")
+    first, second = revalidate(client, "/static/styles.css", **{"Accept-Encoding": "gzip"})
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert first.get_data() == (tmp_path / "styles.css.gz").read_bytes()
+    assert len(first.get_data()) < len(raw.get_data())
+    assert second.status_code == 304
+    for response in (raw, first):
+        response.close()
+
+
+def test_index_pages_end_at_last_page(client):
+    page_count = len(print_app.page_store.pages())
+    last = -(-page_count // print_app.PAGE_SIZE)
+    response = client.get(f"/?page={last}")
+    assert response.status_code == 200 and "?page=" + str(last + 1) not in response.get_data(as_text=True)
+    assert client.get(f"/?page={last + 1}").status_code == 404
+    assert client.get("/?page=2&size=0").status_code == 404
+    assert client.get("/week/99/99").status_code == 404
@@ -0,0 +1,96 @@
+"""Regression tests of 02_Candlestick/candlestick_function.py
+
+The vectorized highlight and segmentation are compared with the per-pixel
+loops they replaced (kept below as reference) on every chart image in
+02_Candlestick/input/image.
+"""
+
+# Imports
+import numpy as np
+import pytest
+from PIL import Image
+import candlestick_function as cf
+from conftest import ROOT
+
+IMAGE_DIR = ROOT / "02_Candlestick" / "input" / "image"
+IMAGES = sorted(path.name for path in IMAGE_DIR.glob("*.PNG"))
+
+
+def reference_highlight(img_list: list) -> dict:
+    """Per-pixel loop of the original highlight_candlestick"""
+
+    CANDLESTICK_POLYMERASE = {}  # {w: [count, lowest_point]}
+    for h in np.arange(len(img_list)):
+        for w in np.arange(len(img_list[h])):
+            r = img_list[h][w][0]
+            g = img_list[h][w][1]
+            if (r + g > 200) & (r - g < -10):
+                if w in CANDLESTICK_POLYMERASE:
+                    CANDLESTICK_POLYMERASE[w][0] += 1
+                    CANDLESTICK_POLYMERASE[w][1] = len(img_list[h]) - h - 1
+                else:
+                    CANDLESTICK_POLYMERASE[w] = [1, len(img_list[h]) - h - 1]
+            elif (r + g > 200) & (r - g > 10):
+                if w in CANDLESTICK_POLYMERASE:
+                    CANDLESTICK_POLYMERASE[w][0] -= 1
+                    CANDLESTICK_POLYMERASE[w][1] = len(img_list[h]) - h - 1
+                else:
+                    CANDLESTICK_POLYMERASE[w] = [-1, len(img_list[h]) - h - 1]
+            else:
+                if w not in CANDLESTICK_POLYMERASE:
+                    CANDLESTICK_POLYMERASE[w] = [0, 0]
+
+    return {k: v for k, v in sorted(CANDLESTICK_POLYMERASE.items(), key=lambda item: item[0])}
+
+
+def reference_segment(candlestick_polymerase: dict) -> list:
+    """Candle walk of the original interpret_candlestick, pixel [open, high, low, close] per candle"""
+
+    CANDLESTICK = []
+    position = 0
+
+    while position < len(candlestick_polymerase):
+        count, low = candlestick_polymerase[position]
+        if count != 0:
+            # Bullish candle stacks pixels above lowest point, bearish below the top
+            high = low + count if count > 0 else low - count
+            candle = [low, high, low, high] if count > 0 else [high, high, low, low]
+            position += 1
+            while position < len(candlestick_polymerase):
+                if candlestick_polymerase[position][0] == 0:
+                    break
+                next_count, next_low = candlestick_polymerase[position]
+                next_high = next_low + next_count if count > 0 else next_low - next_count
+                if (high != next_high) | (low != next_low):
+                    candle[1], candle[2] = next_high, next_low
+                position += 1
+            CANDLESTICK.append(candle)
+        position += 1
+
+    return CANDLESTICK
+
+
+@pytest.fixture(scope="module")
+def image_buffer():
+    return cf.ImageBuffer()
+
+
+@pytest.mark.parametrize("img_file", IMAGES)
+def test_highlight_and_segment_match_pixel_loop(img_file, image_buffer):
+    with Image.open(IMAGE_DIR / img_file) as IMG:
+        img_array = np.asarray(IMG)
+    polymerase = reference_highlight(img_array.tolist())
+
+    # Vectorized highlight over decoded channels and over the pixel array
+    count, lowest_point = cf.highlight_candlestick_channels(*image_buffer.load(str(IMAGE_DIR / img_file)))
+    assert {w: [int(c), int(l)] for w, (c, l) in enumerate(zip(count, lowest_point))} == polymerase
+    assert cf.highlight_candlestick(img_array) == polymerase
+
+    # Vectorized segmentation
+    ohlc = cf.segment_candlestick(count, lowest_point)
+    assert ohlc.tolist() == reference_segment(polymerase)
+    assert len(ohlc) > 0
+
+
+def test_image_set_is_complete():
+    assert len(IMAGES) == 28
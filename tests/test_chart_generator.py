@@ -0,0 +1,50 @@
+"""Tests of 04_Print/candlestick_chart/chart_generator.py join_change on synthetic bars"""
+
+# Imports
+import numpy as np
+import pandas as pd
+import pytest
+import chart_generator as cg
+
+# Hourly bars 00:00-05:00, market closed 06:00-09:00, bars again 10:00-12:00
+TIMES = pd.to_datetime(["2022-01-03 %02d:00" % hour for hour in (0, 1, 2, 3, 4, 5, 10, 11, 12)])
+
+
+@pytest.fixture
+def bars() -> pd.DataFrame:
+    open_price = 100.0 + np.arange(len(TIMES))
+    return pd.DataFrame({'datetime': TIMES, 'open': open_price, 'close': open_price + 0.5,
+                         '%Change': np.round(100 * 0.5 / open_price, 4)})
+
+
+def news(*hours) -> pd.DataFrame:
+    return pd.DataFrame({'h_datetime': pd.to_datetime(["2022-01-03 %02d:00" % hour for hour in hours])})
+
+
+def change(start: float, end: float) -> float:
+    return np.round(100 * (end - start) / start, 4)
+
+
+def test_join_change_horizons_are_hours_not_bars(bars):
+    df_forex = cg.join_change(news(1, 4, 5), bars, horizons=(2,))
+
+    # 01:00 + 2h: open of 01:00 bar -> close of 02:00 bar, 04:00 + 2h: -> close of 05:00 bar
+    assert df_forex['%change_2h'][0] == change(101.0, 102.5)
+    assert df_forex['%change_2h'][1] == change(104.0, 105.5)
+    # 05:00 + 2h falls in the gap: no bar ends at 07:00 (counting bars would reach 10:00)
+    assert np.isnan(df_forex['%change_2h'][2])
+    assert df_forex['%change'].tolist() == bars['%Change'][[1, 4, 5]].tolist()
+
+
+def test_join_change_tolerance_reads_prices_as_of_news_hour(bars):
+    df_forex = cg.join_change(news(5, 7, 11), bars, horizons=(2, 4), tolerance=pd.Timedelta(hours=2))
+
+    # 05:00 + 2h: last close by 07:00 is the 05:00 bar (ended 06:00, 1h back)
+    assert df_forex['%change_2h'][0] == change(105.0, 105.5)
+    # 07:00 in the gap: starts from the close of the 05:00 bar, not its open
+    assert df_forex['%change'][1] == bars['%Change'][5]
+    assert np.isnan(df_forex['%change_2h'][1])
+    assert df_forex['%change_4h'][1] == change(105.5, 106.5)
+    # 11:00 + 2h ends with the data, 11:00 + 4h is past the last bar
+    assert df_forex['%change_2h'][2] == change(107.0, 108.5)
+    assert np.isnan(df_forex['%change_4h'][2])
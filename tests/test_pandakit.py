@@ -0,0 +1,34 @@
+"""Tests of 00_Pinksheepkit/matplotkit/pandakit.py against pandas groupby"""
+
+# Imports
+import numpy as np
+import pandas as pd
+import pytest
+from matplotkit import pandakit as pdk
+
+
+def groupby_count(columns: list, sort: bool) -> list:
+    df = pd.DataFrame({f"i{step}": column for step, column in enumerate(columns)})
+    counted = df.groupby(list(df.columns), sort=sort).size().reset_index(name="count")
+    return [counted[col].to_numpy() for col in counted.columns]
+
+
+# (rows, distinct values per column): dense key space and sparse key space (250 ** 3 keys)
+@pytest.mark.parametrize("rows, values", [(10000, 5), (250, 250), (5000, 3000)])
+@pytest.mark.parametrize("sort", [True, False])
+def test_agg_count_matches_groupby(rows, values, sort):
+    rng = np.random.default_rng(rows)
+    columns = [rng.integers(0, values, rows) for _ in range(3)]
+
+    counted = pdk.agg_count(*columns, sort=sort)
+    assert all(np.array_equal(a, b) for a, b in zip(counted, groupby_count(columns, sort)))
+    assert counted[-1].dtype == np.int64
+
+    chunks = [tuple(column[start:start + 97] for column in columns) for start in range(0, rows, 97)]
+    merged = pdk.agg_count_chunks(chunks, sort=sort)
+    assert all(np.array_equal(a, b) for a, b in zip(merged, groupby_count(columns, sort)))
+
+
+def test_agg_count_drops_na_and_keeps_labels():
+    x, y, count = pdk.agg_count(["b", "a", None, "b"], [1.0, 2.0, 3.0, 1.0])
+    assert x.tolist() == ["a", "b"] and y.tolist() == [2.0, 1.0] and count.tolist() == [1, 2]
@@ -0,0 +1,174 @@
+"""Tests of 01_Scrapper/scrapper_function.py against saved calendar pages"""
+
+# Imports
+import datetime as dt
+import io
+import sqlite3
+import time
+import pandas as pd
+import pytest
+import scrapper_function as sf
+from calendar_server import CalendarServer
+from conftest import CALENDAR_FIXTURES
+
+ROW = '''<tr class="calendar__row calendar_row">
+<td class="calendar__cell calendar__time time">
+<div>8:30am</div></td>
+<td class="calendar__cell calendar__currency currency">{currency}</td>
+<td class="calendar__cell calendar__impact impact">
+<span title="High Impact Expected"></span></td>
+<td class="calendar__cell calendar__event event">
+<div>
+<span>CPI m/m</span></div></td>
+<td class="calendar__cell actual"><span>0.4%</span></td>
+<td class="calendar__cell forecast"><span>0.3%</span></td>
+<td class="calendar__cell previous"><span class="revised worse">0.2%</span></td>
+</tr>'''
+
+
+def test_parse_calendar_matches_tree(calendar_pages):
+    assert len(calendar_pages) > 0
+    for html, date in calendar_pages:
+        assert sf.parse_calendar(html, date) == sf.parse_calendar_tree(html, date), date
+
+
+@pytest.mark.parametrize("currency", ["", "<b>USD</b><i>EUR</i>", "<b>USD</b><i>EUR</i><u>GBP</u>"])
+def test_parse_calendar_stops_at_row_without_single_currency(currency):
+    html = "<table>" + ROW.format(currency="USD") + ROW.format(currency=currency) + \
+        ROW.format(currency="EUR") + "</table>"
+    date = dt.datetime(2022, 1, 3)
+
+    rows = sf.parse_calendar(html, date)
+    assert rows == sf.parse_calendar_tree(html, date)
+    assert [row[2] for row in rows] == ["USD"]
+
+
+def test_benchmark_parse_calendar(calendar_pages):
+    result = sf.benchmark_parse_calendar(calendar_pages, repeat=1)
+    assert set(result) == {"parse_calendar_tree", "parse_calendar"}
+    assert all(pages_per_second > 0 for pages_per_second in result.values())
+
+
+# Fetch engine against the local stand-in (tests/calendar_server.py)
+DATES = [dt.datetime(2022, 1, 3) + dt.timedelta(days=day) for day in range(7)]
+
+
+def calendar_day(date: dt.datetime) -> str:
+    """?day= query of date i.e. jan3.2022"""
+    return sf.calendar_url(date, "").split("=")[1]
+
+
+def saved_page(date: dt.datetime) -> str:
+    return (CALENDAR_FIXTURES / (calendar_day(date) + ".html")).read_text(encoding="utf-8")
+
+
+def test_fetch_calendars_yields_pages_in_input_order():
+    # First dates answer last, so completion order differs from input order
+    dates = DATES[::-1]
+    delay = {calendar_day(date): 0.05 * (len(dates) - step) for step, date in enumerate(dates)}
+    with CalendarServer(delay=delay) as server:
+        pages = list(sf.fetch_calendars(dates, concurrency=4, rate=0, base_url=server.base_url))
+
+    assert [date for date, _ in pages] == dates
+    assert all(html == saved_page(date) for date, html in pages)
+
+
+def test_fetch_calendars_respects_rate_limit():
+    rate = 10
+    with CalendarServer() as server:
+        list(sf.fetch_calendars(DATES, concurrency=4, rate=rate, base_url=server.base_url))
+        times = [hit_time for _, hit_time in server.hits]
+
+    assert len(times) == len(DATES)
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert times[-1] - times[0] >= 0.9 * (len(DATES) - 1) / rate
+    assert min(gaps) >= 0.5 / rate
+
+
+def test_rate_limiter_spaces_request_starts():
+    limiter = sf.RateLimiter(20)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait()
+    assert time.monotonic() - start >= 0.9 * 4 / 20
+    assert sf.RateLimiter(0).interval == 0
+
+
+def test_fetch_calendars_retries_5xx():
+    with CalendarServer(fail={"jan4.2022": 2, "jan6.2022": 1}) as server:
+        pages = dict(sf.fetch_calendars(DATES, concurrency=2, rate=0, base_url=server.base_url))
+        days = server.days()
+
+    assert all(pages[date] == saved_page(date) for date in DATES)
+    assert days.count("jan4.2022") == 3
+    assert days.count("jan6.2022") == 2
+    assert days.count("jan3.2022") == 1
+
+
+def test_calendar_cache_serves_saved_days_without_requests(tmp_path):
+    with CalendarServer() as server:
+        cache = sf.CalendarCache(tmp_path / "cache", base_url=server.base_url)
+        first = list(sf.fetch_calendars(DATES, rate=0, base_url=server.base_url, cache=cache))
+        hits = len(server.hits)
+        second = list(sf.fetch_calendars(DATES, rate=0, base_url=server.base_url, cache=cache))
+
+    assert hits == len(DATES) and len(server.hits) == hits
+    assert first == second
+
+
+def reference_rows(dates: list) -> pd.DataFrame:
+    """Rows of parse_calendar_tree over saved pages as they appear in the output csv"""
+    rows = []
+    for date in dates:
+        rows += sf.parse_calendar_tree(saved_page(date), date)
+    df = pd.DataFrame(rows, columns=sf.HEADER).drop_duplicates()
+    df['date'] = pd.to_datetime(df['date'], format="%a, %d %b %y").dt.strftime("%Y-%m-%d")
+    return pd.read_csv(io.StringIO(df.to_csv(index=False))).sort_values(sf.HEADER).reset_index(drop=True)
+
+
+def read_output(path) -> pd.DataFrame:
+    return pd.read_csv(path, index_col=0).sort_values(sf.HEADER).reset_index(drop=True)
+
+
+def test_forex_factory_scrapper_csv_resume_and_sqlite(tmp_path):
+    start, end = DATES[0], DATES[-1] + dt.timedelta(days=2)  # last day of range is end - 2 days
+    with CalendarServer() as server:
+        path = sf.forex_factory_scrapper(start, end, rate=0, base_url=server.base_url,
+                                         path_output=tmp_path / "full",
+                                         sink=sf.CSVSink(tmp_path / "full", "FOREX", chunk_size=10))
+        full = pd.read_csv(path, index_col=0)
+        assert len(full) > 0 and full["date"].is_monotonic_decreasing
+        pd.testing.assert_frame_equal(read_output(path), reference_rows(DATES))
+
+        # Resume from first days only -> only days without rows are fetched
+        full.loc[full['date'] < "2022-01-06"].reset_index(drop=True).to_csv(tmp_path / "half.csv")
+        requested = len(server.hits)
+        resumed = sf.forex_factory_scrapper(start, end, rate=0, base_url=server.base_url,
+                                            path_output=tmp_path / "resume", resume=tmp_path / "half.csv")
+        assert sorted(server.days()[requested:]) == sorted(
+            calendar_day(date) for date in DATES[3:])
+        pd.testing.assert_frame_equal(read_output(resumed), read_output(path))
+
+        database = sf.forex_factory_scrapper(start, end, rate=0, base_url=server.base_url,
+                                             sink=sf.SQLiteSink(tmp_path / "db", "FOREX"))
+    with sqlite3.connect(database) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM forex").fetchone()[0] == len(full)
+
+
+def test_csv_sink_keeps_part_file_of_crashed_run(tmp_path):
+    with CalendarServer() as server:
+        # Crashed run: three days appended, then a row torn mid-write and no close()
+        crashed = sf.CSVSink(tmp_path, "FOREX")
+        for _, rows in sf.iter_forex_factory(DATES[:3], rate=0, base_url=server.base_url):
+            crashed.write(rows)
+        crashed.file.write("2022-01-06,1:00am,US")
+        crashed.file.close()
+
+        requested = len(server.hits)
+        path = sf.forex_factory_scrapper(DATES[0], DATES[-1] + dt.timedelta(days=2), rate=0,
+                                         base_url=server.base_url, sink=sf.CSVSink(tmp_path, "FOREX"))
+        # Last day of the part file may be incomplete, so it is fetched again
+        assert sorted(server.days()[requested:]) == sorted(calendar_day(date) for date in DATES[2:])
+
+    pd.testing.assert_frame_equal(read_output(path), reference_rows(DATES))
+    assert not (tmp_path / "FOREX.part.csv").exists()
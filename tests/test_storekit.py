@@ -0,0 +1,73 @@
+"""Tests of 00_Pinksheepkit/marketkit/storekit.py typed stores"""
+
+# Imports
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+from marketkit import storekit as stk
+from conftest import ROOT
+
+UNIVERSAL_DATA = ROOT / "00_Pinksheepkit" / "universal_data"
+
+
+@pytest.mark.parametrize("read_csv, name", [(stk.read_bars_csv, "XAUUSD-1H_220103_230503.csv"),
+                                            (stk.read_events_csv, "FOREX_220103_230513.csv")])
+def test_npz_store_round_trips_csv_dtypes(tmp_path, read_csv, name):
+    df = read_csv(UNIVERSAL_DATA / name)
+    path = stk.write_store(df, tmp_path / "store.npz")
+
+    pd.testing.assert_frame_equal(stk.read_store(path), df)
+    with np.load(path, allow_pickle=False) as store:
+        assert all(store[key].dtype != object for key in store.files)
+
+
+def test_npz_store_rejects_columns_it_cannot_store_without_pickle(tmp_path):
+    df = pd.DataFrame({"value": [1, None, "a"]}, dtype=object).assign(value=lambda df: [[1], None, (2,)])
+    with pytest.raises(TypeError):
+        stk.write_store(df, tmp_path / "store.npz")
+    assert not (tmp_path / "store.npz").exists()
+
+
+def test_pickle_store_is_not_read(tmp_path):
+    path = tmp_path / "store.pkl"
+    pd.DataFrame({"value": [1.0]}).to_pickle(path)
+    with pytest.raises(ValueError):
+        stk.read_store(path)
+
+
+@pytest.fixture
+def df_bars() -> pd.DataFrame:
+    return stk.read_bars_csv(UNIVERSAL_DATA / "XAUUSD-1H_220103_230503.csv").iloc[:100]
+
+
+def test_bar_file_append_cuts_torn_record(tmp_path, df_bars):
+    bar_file = stk.BarFile(tmp_path / "XAUUSD-1H.bars")
+    assert bar_file.append(df_bars.iloc[:50]) == 50
+
+    # Crash mid-append leaves part of a record behind
+    with open(bar_file.path, "ab") as file:
+        file.write(b"\0" * (stk.BAR_DTYPE.itemsize // 2))
+    assert len(bar_file) == 50
+
+    assert bar_file.append(df_bars.iloc[50:]) == 50
+    assert bar_file.path.stat().st_size == 100 * stk.BAR_DTYPE.itemsize
+    pd.testing.assert_frame_equal(bar_file.bars(), df_bars)
+
+
+def test_bar_file_append_warns_about_dropped_bars(tmp_path, df_bars):
+    bar_file = stk.BarFile(tmp_path / "XAUUSD-1H.bars")
+    df_bars.loc[60, '%Change'] = np.nan
+    assert bar_file.append(df_bars.iloc[50:]) == 50
+
+    # Rerun of stored bars (NaN %Change included) is skipped quietly
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert bar_file.append(df_bars.iloc[50:]) == 0
+
+    # Bars before the last one that are missing or differ cannot be inserted
+    with pytest.warns(UserWarning, match="10 bars"):
+        assert bar_file.append(df_bars.iloc[40:]) == 0
+    with pytest.warns(UserWarning, match="1 bars"):
+        assert bar_file.append(df_bars.iloc[[70]].assign(close=0.0)) == 0
+    pd.testing.assert_frame_equal(bar_file.bars(), df_bars.iloc[50:].reset_index(drop=True))